@@ -1,4 +1,6 @@
+import os
 import sqlite3
+import zlib
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 
@@ -9,9 +11,14 @@ def get_kst_date():
     kst = timezone(timedelta(hours=9))
     return datetime.now(kst).strftime("%Y-%m-%d")
 
-def connect():
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+def connect(uri=None):
+    # uri(또는 TRADING_DB_URI) 지정 시 해당 URI로 연결 (예: 검증용 file:test32?mode=memory&cache=shared)
+    uri = uri or os.environ.get("TRADING_DB_URI")
+    if uri:
+        conn = sqlite3.connect(uri, uri=True, timeout=30, isolation_level=None)
+    else:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
     conn.execute("PRAGMA journal_mode=WAL;")
     return conn
 
@@ -21,14 +28,8 @@ def _column_exists(conn, table_name, column_name):
     columns = [row[1] for row in cursor.fetchall()]
     return column_name in columns
 
-def init_schema(conn):
-    """
-    스키마 초기화 및 마이그레이션 (완전 이등분성: 여러 번 안전).
-    - orders_intent: ts, created_at, trade_day, symbol, action, ai_score, ttl_ms, params_version_id, status
-    - execution_log: ts, module, symbol, action, decision, rejection_reason, ai_score, params_version_id, order_id, context
-    """
-    # CREATE TABLE: 스키마 완전 정의 (IF NOT EXISTS 안전)
-    conn.executescript("""
+# CREATE TABLE: 스키마 완전 정의 (IF NOT EXISTS 안전)
+_SCHEMA_DDL = """
     CREATE TABLE IF NOT EXISTS orders_intent (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         ts TEXT NOT NULL,
@@ -55,31 +56,93 @@ def init_schema(conn):
         order_id TEXT,
         context TEXT
     );
-    """)
+    """
 
-    # 마이그레이션 1: orders_intent에 created_at 추가 (이미 있으면 무시)
-    if not _column_exists(conn, 'orders_intent', 'created_at'):
-        try:
-            conn.execute("ALTER TABLE orders_intent ADD COLUMN created_at TEXT")
-            print("[DB] Migrated: Added created_at column to orders_intent")
-        except sqlite3.OperationalError as e:
-            print(f"[DB] Skipped created_at migration: {e}")
+# 앱별 스키마 체크섬 기록 (app32/app64가 같은 DB 파일을 공유해도 서로 덮어쓰지 않음)
+_META_DDL = """
+    CREATE TABLE IF NOT EXISTS _schema_meta (
+        app TEXT PRIMARY KEY,
+        sig INTEGER NOT NULL
+    );
+    """
+
+# 인덱스: DAILY_LIMIT 쿼리 최적화 (IF NOT EXISTS 안전)
+_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_orders_intent_trade_day_status_action "
+    "ON orders_intent (trade_day, status, action);"
+)
+
+# 테이블 + 인덱스 전체 DDL: executescript 한 번(sqlite3_exec 1회)으로 실행
+_DDL = _SCHEMA_DDL + _META_DDL + _INDEX_DDL
+
+# 구버전 DB용 컬럼 마이그레이션 (테이블, 컬럼, 타입) - 순서대로 ALTER TABLE ADD COLUMN
+_MIGRATIONS = (
+    ("orders_intent", "created_at", "TEXT"),
+    ("orders_intent", "trade_day", "TEXT"),
+    ("execution_log", "order_id", "TEXT"),
+)
+
+# DDL + 마이그레이션 체크섬: _schema_meta의 이 앱 행에 기록, 같으면 DDL/마이그레이션 생략
+# (_MIGRATIONS 항목을 추가하면 체크섬이 바뀌어 기존 DB에서도 다시 실행됨)
+_APP_NAME = "app64"
+_SCHEMA_SIG = zlib.crc32((_DDL + repr(_MIGRATIONS)).encode()) & 0x7fffffff
+
+# 체크섬 생략 전 확인할 스키마 객체 (DB 파일 교체/삭제 대비)
+_SCHEMA_OBJECTS = ("orders_intent", "execution_log", "idx_orders_intent_trade_day_status_action")
+_SCHEMA_CHECK_SQL = (
+    "SELECT (SELECT sig FROM _schema_meta WHERE app = ?), "
+    "(SELECT COUNT(*) FROM sqlite_master WHERE name IN (?, ?, ?))"
+)
+
+def _schema_current(conn):
+    """이 앱의 체크섬이 기록되어 있고 테이블/인덱스가 모두 있으면 True"""
+    try:
+        row = conn.execute(_SCHEMA_CHECK_SQL, (_APP_NAME,) + _SCHEMA_OBJECTS).fetchone()
+    except sqlite3.OperationalError:  # _schema_meta 없음 (처음 초기화하는 DB)
+        return False
+    return row == (_SCHEMA_SIG, len(_SCHEMA_OBJECTS))
+
+def _migrate_schema(conn):
+    """CREATE TABLE + 컬럼 마이그레이션 + 인덱스 (모두 멱등)."""
+    # 구버전 DB(trade_day 컬럼 없음) 등으로 인덱스 단계가 실패하면
+    # 테이블 DDL만 다시 실행(테이블 오류는 그대로 전파)하고,
+    # 인덱스는 컬럼 마이그레이션 후 다시 시도 (실패 시 건너뜀)
+    index_pending = False
+    try:
+        conn.executescript(_DDL)
+    except sqlite3.OperationalError:
+        conn.executescript(_SCHEMA_DDL + _META_DDL)
+        index_pending = True
     
-    # 마이그레이션 2: orders_intent에 trade_day 추가 (이미 있으면 무시)
-    if not _column_exists(conn, 'orders_intent', 'trade_day'):
-        try:
-            conn.execute("ALTER TABLE orders_intent ADD COLUMN trade_day TEXT")
-            print("[DB] Migrated: Added trade_day column to orders_intent")
-        except sqlite3.OperationalError as e:
-            print(f"[DB] Skipped trade_day migration: {e}")
+    # 컬럼 마이그레이션 (이미 있으면 무시)
+    for table, column, col_type in _MIGRATIONS:
+        if not _column_exists(conn, table, column):
+            try:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+                print(f"[DB] Migrated: Added {column} column to {table}")
+            except sqlite3.OperationalError as e:
+                print(f"[DB] Skipped {column} migration: {e}")
     
-    # 마이그레이션 3: execution_log에 order_id 추가 (이미 있으면 무시)
-    if not _column_exists(conn, 'execution_log', 'order_id'):
+    # 인덱스: 컬럼 마이그레이션 이후 재시도 (첫 DDL 실행에서 실패한 경우만)
+    if index_pending:
         try:
-            conn.execute("ALTER TABLE execution_log ADD COLUMN order_id TEXT")
-            print("[DB] Migrated: Added order_id column to execution_log")
+            conn.execute(_INDEX_DDL)
         except sqlite3.OperationalError as e:
-            print(f"[DB] Skipped order_id migration: {e}")
+            print(f"[DB] Skipped index creation: {e}")
+
+def init_schema(conn):
+    """
+    스키마 초기화 및 마이그레이션 (완전 이등분성: 여러 번 안전).
+    - orders_intent: ts, created_at, trade_day, symbol, action, ai_score, ttl_ms, params_version_id, status
+    - execution_log: ts, module, symbol, action, decision, rejection_reason, ai_score, params_version_id, order_id, context
+    """
+    # 같은 DDL로 이미 초기화된 DB면 DDL 재실행 생략 (_schema_meta 체크섬)
+    if not _schema_current(conn):
+        _migrate_schema(conn)
+        conn.execute(
+            "INSERT OR REPLACE INTO _schema_meta (app, sig) VALUES (?, ?)",
+            (_APP_NAME, _SCHEMA_SIG),
+        )
     
     # 마이그레이션 4: 기존 NULL trade_day 값 백필 (KST 기준)
     try:
@@ -95,12 +158,3 @@ def init_schema(conn):
             print(f"[DB] Backfilled {null_count} NULL trade_day values from ts")
     except sqlite3.OperationalError as e:
         print(f"[DB] Skipped trade_day backfill: {e}")
-    
-    # 인덱스: DAILY_LIMIT 쿼리 최적화 (IF NOT EXISTS 안전)
-    try:
-        conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_orders_intent_trade_day_status_action "
-            "ON orders_intent (trade_day, status, action)"
-        )
-    except sqlite3.OperationalError as e:
-        print(f"[DB] Skipped index creation: {e}")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+분석 도구 고속 경로 검증 테스트
+
+tools/ 의 최적화 경로(pandas 벡터화, 캐시, 스트리밍 통계 등)가
+기본 경로와 같은 결과를 내는지 동일 데이터로 비교한다.
+
+    python -m pytest -q tests/test_analysis_fast_paths.py
+"""
+
+import json
+import os
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+import analyze_execution
+import analyze_logs
+import research_engine
+
+EVENT_TYPES = ['SIGNAL_CREATED', 'INTENT_INSERTED', 'EXEC_SENT', 'EXEC_REJECTED', 'OTHER', None]
+
+def _sample_events(n, seed=7):
+    """필드 누락/ null 값이 섞인 랜덤 이벤트"""
+    rng = random.Random(seed)
+    choices = {
+        'event_type': EVENT_TYPES,
+        'symbol': ['005930', '035420', None],
+        'action': ['BUY', 'SELL', None],
+        'ai_score': [1, 0.55, 0.72, None],
+        'params_version_id': ['v1', 'v2', None],
+        'ts': ['2024-01-01T09:00:0%dZ' % (i % 10) for i in range(10)] + ['', None],
+        'rejection_reason': ['COOLDOWN', 'TTL_EXPIRED', None],
+    }
+    events = []
+    for _ in range(n):
+        event = {}
+        for key, values in choices.items():
+            if rng.random() < 0.15:
+                continue  # 키 자체가 없는 경우
+            event[key] = rng.choice(values)
+        events.append(event)
+    return events
+
+def _plain(metrics):
+    """defaultdict 등을 비교 가능한 일반 dict로"""
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in metrics.items()}
+
+@pytest.mark.skipif(analyze_logs.pd is None, reason="pandas 미설치")
+def test_vectorized_matches_loop_with_null_fields():
+    """pandas 경로와 루프 경로가 null 필드 포함 동일 결과"""
+    events = _sample_events(3000)
+    loop = analyze_logs._empty_metrics(len(events))
+    analyze_logs._tally_events(events, loop)
+    vectorized = analyze_logs._analyze_events_vectorized(events)
+
+    assert _plain(vectorized) == _plain(loop)
+    # 값 타입까지 동일 (int ai_score 가 float 로 바뀌지 않음)
+    assert [type(v) for v in vectorized['ai_scores_sent']] == [type(v) for v in loop['ai_scores_sent']]
+
+def test_serial_and_pool_line_split_match(tmp_path):
+    """직렬 경로와 Pool 경로가 같은 줄 분할 (\\r, \\x0c 포함)"""
+    path = tmp_path / "mixed.jsonl"
+    path.write_bytes(
+        b'{"event_type": "EXEC_SENT", "symbol": "A\\u2028"}\r\n'
+        b'{"event_type": "SIGNAL_CREATED"}\r{"event_type": "X"}\n'
+        b'{"event_type": "EXEC_REJECTED", "note": "\x0c"}\n'
+        b'\n'
+        b'{"event_type": "INTENT_INSERTED"}'
+    )
+    serial = analyze_logs._parse_lines(analyze_logs._iter_lines(path.read_bytes()), path.name)
+    pooled = analyze_logs._parse_file(str(path))
+    assert serial == pooled
+
+def test_p2_quantile_tracks_exact_percentiles():
+    """P² 추정이 정확한 백분위에 근접 (큰 균등 표본)"""
+    rng = random.Random(11)
+    values = [rng.uniform(0, 1000) for _ in range(20000)]
+    acc = analyze_execution.LatencyAccumulator()
+    for v in values:
+        acc.add(v)
+    ordered = sorted(values)
+    for p in analyze_execution.LatencyAccumulator.PERCENTILES:
+        assert acc.quantile(p) == pytest.approx(ordered[int(len(ordered) * p)], abs=10)
+
+def test_latency_accumulator_exact_mode_matches_summary():
+    """EXACT_LATENCY_MAX 이하에서는 latency_summary 와 동일"""
+    rng = random.Random(3)
+    values = [rng.uniform(10, 5000) for _ in range(analyze_execution.EXACT_LATENCY_MAX)]
+    acc = analyze_execution.LatencyAccumulator()
+    for v in values:
+        acc.add(v)
+    assert acc.summary() == analyze_execution.latency_summary(values)
+
+def test_welford_merge_matches_single_pass():
+    """파일별 Welford 누적을 Chan 공식으로 병합해도 전체 평균/표준편차와 같음"""
+    rng = random.Random(5)
+    values = [rng.random() for _ in range(5000)]
+    merged = research_engine.Welford()
+    for start in range(0, len(values), 700):
+        part = research_engine.Welford()
+        for v in values[start:start + 700]:
+            part.push(v)
+        merged.merge(part)
+    merged.merge(research_engine.Welford())  # 빈 누적값 병합은 무변화
+    assert merged.n == len(values)
+    assert merged.mean() == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert merged.std() == pytest.approx(statistics.stdev(values), rel=1e-9)
+
+def test_spear_bins_percentile_within_one_bin():
+    """SpearBins 백분위 오차가 구간 폭 이내, 병합 결과도 동일"""
+    rng = random.Random(9)
+    values = [rng.random() for _ in range(10000)]
+    whole, left, right = research_engine.SpearBins(), research_engine.SpearBins(), research_engine.SpearBins()
+    for i, v in enumerate(values):
+        whole.push(v)
+        (left if i % 2 else right).push(v)
+    left.merge(right)
+    ordered = sorted(values)
+    width = 1.0 / whole.nbins
+    for q in (5, 50, 95):
+        assert whole.percentile(q) == pytest.approx(ordered[int(len(ordered) * q / 100)], abs=width)
+    assert left.counts == whole.counts and left.n == whole.n
+
+def test_score_accumulator_switches_to_bins(monkeypatch):
+    """EXACT_SCORE_MAX 초과 시 버퍼를 버리고 구간 추정으로 전환 (병합 포함)"""
+    monkeypatch.setattr(research_engine, 'EXACT_SCORE_MAX', 500)
+    rng = random.Random(13)
+    values = [rng.random() for _ in range(1200)]
+    single = research_engine.ScoreAccumulator()
+    for v in values:
+        single.push(v)
+    merged = research_engine.ScoreAccumulator()
+    for start in range(0, len(values), 300):
+        part = research_engine.ScoreAccumulator()
+        for v in values[start:start + 300]:
+            part.push(v)
+        merged.merge(part)
+
+    width = 1.0 / research_engine.SpearBins().nbins
+    for acc in (single, merged):
+        assert acc.samples is None
+        assert acc.median() == pytest.approx(statistics.median(values), abs=width)
+        assert acc.mean() == pytest.approx(statistics.fmean(values))
+    assert merged.bins.counts == single.bins.counts
+
+def _assert_version_equal(cached, fresh):
+    """summarize_version 결과 비교 (Welford 병합 순서에 따른 부동소수 오차 허용)"""
+    assert cached.keys() == fresh.keys()
+    for key, value in fresh.items():
+        if key == 'ai_score_stats':
+            for kind, stats in value.items():
+                assert cached[key][kind] == pytest.approx(stats)
+        elif isinstance(value, float):
+            assert cached[key] == pytest.approx(value)
+        else:
+            assert cached[key] == value
+
+def _write_log(path, events):
+    path.write_text(''.join(json.dumps(e) + '\n' for e in events))
+
+def test_tally_cache_matches_full_parse(tmp_path):
+    """파일별 집계 캐시 재사용 결과가 전체 재파싱과 같고 바뀐 파일만 다시 집계"""
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    cache_file = tmp_path / "cache" / "tallies.pkl"
+    # research_engine 은 ai_score/ts 가 채워진 이벤트를 전제로 함
+    events = [dict(e, ts=e.get('ts') or '2024-01-01T09:00:00Z', ai_score=e.get('ai_score') or 0.5)
+              for e in _sample_events(900, seed=21)]
+    for i in range(3):
+        _write_log(logs / f"app_{i}.jsonl", events[i * 300:(i + 1) * 300])
+
+    def fresh():
+        by_version = research_engine.categorize_events(research_engine.iter_events(str(logs)))
+        return {v: research_engine.analyze_version(g, v) for v, g in by_version.items()}
+
+    for round_ in range(3):
+        if round_ == 2:
+            _write_log(logs / "app_1.jsonl", events[300:450])  # 파일 하나 변경
+            os.utime(logs / "app_1.jsonl", ns=(1, 1))
+        tallies, _ = research_engine.load_version_tallies(str(logs), cache_file)
+        expected = fresh()
+        assert tallies.keys() == expected.keys()
+        for version_id, tally in tallies.items():
+            _assert_version_equal(research_engine.summarize_version(tally, version_id), expected[version_id])
+        assert cache_file.exists()
+        assert len(research_engine._read_tally_cache(cache_file)) == 3
+
+@pytest.mark.skipif(analyze_logs.pq is None, reason="pyarrow 미설치")
+def test_parquet_cache_round_trip(tmp_path, capsys):
+    """중첩/null/혼합 타입 필드도 Parquet 캐시에서 그대로 복원"""
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    events = [
+        {'event_type': 'EXEC_SENT', 'ai_score': 1, 'params_snapshot': {'cooldown_sec': 30, 'one_position_only': True}},
+        {'event_type': 'EXEC_REJECTED', 'ai_score': 0.5, 'rejection_reason': None, 'context': {'k': [1, 2.5, None]}},
+        {'event_type': 'SIGNAL_CREATED', 'ai_score': True, 'symbol': '삼성전자'},
+    ]
+    _write_log(logs / "a.jsonl", events)
+    cache_dir = tmp_path / "cache"
+    parsed = analyze_logs.load_jsonl_files(logs, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("events_*.parquet"))) == 1
+    cached = analyze_logs.load_jsonl_files(logs, cache_dir=cache_dir)
+    assert cached == parsed == events
+    assert [{k: type(v) for k, v in e.items()} for e in cached] == [{k: type(v) for k, v in e.items()} for e in events]
+
+    # 객체가 아닌 JSON 줄이 있으면 캐시를 건너뛰고 stderr 에 알림
+    with open(logs / "a.jsonl", "a") as f:
+        f.write('[1, 2]\n')
+    analyze_logs.load_jsonl_files(logs, cache_dir=cache_dir)
+    assert "Event cache skipped" in capsys.readouterr().err
+
+def test_cython_tally_matches_python():
+    """Cython 빌드된 집계 루프가 순수 파이썬 루프와 동일 (미빌드 시 건너뜀)"""
+    if analyze_logs._tally_events_ext is None:
+        pytest.skip("_analyze_events 확장 미빌드")
+    events = _sample_events(2000)
+    expected = analyze_logs._empty_metrics(len(events))
+    analyze_logs._tally_events(events, expected)
+    actual = analyze_logs._empty_metrics(len(events))
+    analyze_logs._tally_events_ext(events, actual)
+    assert _plain(actual) == _plain(expected)
+
+@pytest.mark.skipif(analyze_execution.np is None, reason="numpy 미설치")
+def test_latency_moments_match_numpy():
+    """Numba(또는 대체) latency_moments 가 NumPy 축약 결과와 같음"""
+    import _stats_kernels
+    np = analyze_execution.np
+    arr = np.random.default_rng(1).uniform(1, 9000, 50001)
+    avg, mn, mx = _stats_kernels.latency_moments(arr)
+    ref_avg, ref_mn, ref_mx = _stats_kernels._latency_moments_numpy(arr)
+    assert (mn, mx) == (ref_mn, ref_mx)
+    assert avg == pytest.approx(ref_avg, rel=1e-12)
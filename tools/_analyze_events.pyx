@@ -0,0 +1,104 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled per-event tally loop for tools/analyze_logs.py
+
+tally_events(events, metrics) is a typed port of analyze_logs._tally_events:
+the counters are C integers and event fields are read with
+PyDict_GetItemString (borrowed references, no .get method dispatch).
+analyze_logs.py uses it when the extension is built and falls back to the
+pure-Python loop otherwise. Build in place with:
+
+    pip install cython
+    cythonize -i tools/_analyze_events.pyx
+"""
+
+from collections import Counter
+
+from cpython.dict cimport PyDict_GetItemString
+from cpython.ref cimport PyObject
+
+
+cdef inline object _field(dict event, const char* key, object default):
+    cdef PyObject* value = PyDict_GetItemString(event, key)
+    if value is NULL:
+        return default
+    return <object>value
+
+
+cdef void _merge_tallies(object target, object created, object sent, object rejected):
+    for key in created.keys() | sent.keys() | rejected.keys():
+        target[key] = {'created': created[key], 'sent': sent[key], 'rejected': rejected[key]}
+
+
+def tally_events(list events, dict metrics):
+    """Per-event counting loop; fills metrics in place"""
+    cdef Py_ssize_t signal_created = 0, intent_inserted = 0
+    cdef Py_ssize_t exec_sent = 0, exec_rejected = 0
+    cdef Py_ssize_t buy_actions = 0, sell_actions = 0
+    cdef dict event
+    cdef object event_type, symbol, action, params_version_id, ts, reason
+    cdef object start_ts = metrics['start_ts'], end_ts = metrics['end_ts']
+
+    events_by_type = metrics['events_by_type']
+    rejection_reasons = metrics['rejection_reasons']
+    per_rejection_reason = metrics['per_rejection_reason']
+    cdef list ai_scores_sent = metrics['ai_scores_sent']
+    cdef list ai_scores_rejected = metrics['ai_scores_rejected']
+    sym_created, sym_sent, sym_rejected = Counter(), Counter(), Counter()
+    ver_created, ver_sent, ver_rejected = Counter(), Counter(), Counter()
+
+    for event in events:
+        event_type = _field(event, "event_type", '')
+        symbol = _field(event, "symbol", 'UNKNOWN')
+        params_version_id = _field(event, "params_version_id", 'UNKNOWN')
+        ts = _field(event, "ts", '')
+
+        if ts:
+            if start_ts is None or ts < start_ts:
+                start_ts = ts
+            if end_ts is None or ts > end_ts:
+                end_ts = ts
+
+        events_by_type[event_type].append(event)
+
+        if event_type == 'SIGNAL_CREATED':
+            signal_created += 1
+            sym_created[symbol] += 1
+            ver_created[params_version_id] += 1
+
+        elif event_type == 'INTENT_INSERTED':
+            intent_inserted += 1
+
+        elif event_type == 'EXEC_SENT':
+            exec_sent += 1
+            sym_sent[symbol] += 1
+            ver_sent[params_version_id] += 1
+            ai_scores_sent.append(_field(event, "ai_score", 0))
+
+            action = _field(event, "action", '')
+            if action == 'BUY':
+                buy_actions += 1
+            elif action == 'SELL':
+                sell_actions += 1
+
+        elif event_type == 'EXEC_REJECTED':
+            exec_rejected += 1
+            sym_rejected[symbol] += 1
+            ver_rejected[params_version_id] += 1
+            ai_scores_rejected.append(_field(event, "ai_score", 0))
+
+            reason = _field(event, "rejection_reason", 'UNKNOWN')
+            rejection_reasons[reason] += 1
+            per_rejection_reason[reason] += 1
+
+    metrics['signal_created_count'] += signal_created
+    metrics['intent_inserted_count'] += intent_inserted
+    metrics['exec_sent_count'] += exec_sent
+    metrics['exec_rejected_count'] += exec_rejected
+    metrics['buy_actions'] += buy_actions
+    metrics['sell_actions'] += sell_actions
+    metrics['start_ts'] = start_ts
+    metrics['end_ts'] = end_ts
+
+    _merge_tallies(metrics['per_symbol'], sym_created, sym_sent, sym_rejected)
+    _merge_tallies(metrics['per_version'], ver_created, ver_sent, ver_rejected)
@@ -0,0 +1,42 @@
+"""
+Numeric kernels for the analysis tools (tools/analyze_execution.py)
+
+latency_moments(arr) fuses the mean/min/max reductions over a float64
+latency array into a single pass. It is JIT-compiled with Numba when
+available; otherwise the same result comes from NumPy reductions.
+Order statistics (median, p95) stay with np.partition in the caller.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _latency_moments_numpy(arr):
+    """(mean, min, max) of a non-empty float64 array via NumPy reductions"""
+    return float(arr.mean()), float(arr.min()), float(arr.max())
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _latency_moments_jit(arr):
+        n = arr.shape[0]
+        total = 0.0
+        mn = arr[0]
+        mx = arr[0]
+        for i in range(n):
+            v = arr[i]
+            total += v
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+        return total / n, mn, mx
+
+    def latency_moments(arr):
+        """(mean, min, max) of a non-empty float64 array in one fused pass"""
+        avg, mn, mx = _latency_moments_jit(np.ascontiguousarray(arr, dtype=np.float64))
+        return float(avg), float(mn), float(mx)
+else:
+    latency_moments = _latency_moments_numpy
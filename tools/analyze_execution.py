@@ -12,59 +12,272 @@ Success Criteria:
     - Average latency_ms < 5000ms (5 seconds)
 """
 
-import json
+import mmap
+import os
+from operator import itemgetter
 import sqlite3
+from array import array
 from pathlib import Path
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
 import sys
 
+# orjson parses bytes directly and is several times faster than stdlib json;
+# fall back to stdlib json (which also accepts bytes) when it is not installed.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# NumPy (optional) selects latency order statistics in O(N) with np.partition
+# instead of sorting the whole sample.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Helper modules next to this script must import regardless of the caller's cwd
+_TOOLS_DIR = str(Path(__file__).resolve().parent)
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
+
+if np is not None:
+    from _stats_kernels import latency_moments  # Numba-compiled when available
+
+# Rows per fetchmany() batch when streaming latencies from SQLite
+DB_FETCH_SIZE = 10000
+
+# LatencyAccumulator keeps samples (exact percentiles) up to this count,
+# then switches to constant-memory P² estimates.
+EXACT_LATENCY_MAX = 1000
+
+# Parsed JSONL entries per batch. Batches only bound memory; the counting
+# itself is done entry by entry in ExecutionAggregator.update().
+PARSE_BATCH_SIZE = 10000
+
+class P2Quantile:
+    """Streaming quantile estimate (P² algorithm, Jain & Chlamtac 1985)"""
+    __slots__ = ('p', 'q', 'n', 'np_', 'dn')
+    
+    def __init__(self, p, first_five):
+        self.p = p
+        self.q = sorted(first_five)
+        self.n = [1, 2, 3, 4, 5]
+        self.np_ = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.dn = (0, p / 2, p, (1 + p) / 2, 1)
+    
+    def add(self, x):
+        q, n, np_ = self.q, self.n, self.np_
+        
+        # Locate the cell containing x, extending the extremes if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            np_[i] += self.dn[i]
+        
+        # Nudge the three middle markers toward their desired positions
+        for i in (1, 2, 3):
+            d = np_[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp
+                n[i] += d
+    
+    def value(self):
+        return self.q[2]
+
+class LatencyAccumulator:
+    """
+    Single-pass latency statistics: running count/mean (Welford)/min/max,
+    exact median/p95 up to EXACT_LATENCY_MAX samples, P² estimates beyond.
+    """
+    __slots__ = ('count', 'mean', 'min', 'max', '_samples', '_quantiles')
+    
+    PERCENTILES = (0.5, 0.95)
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.min = None
+        self.max = None
+        self._samples = []
+        self._quantiles = None
+    
+    def __len__(self):
+        return self.count
+    
+    def add(self, x):
+        self.count += 1
+        self.mean += (x - self.mean) / self.count
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+        
+        if self._quantiles is not None:
+            for est in self._quantiles:
+                est.add(x)
+        else:
+            self._samples.append(x)
+            if len(self._samples) > EXACT_LATENCY_MAX:
+                # Switch to streaming estimates and drop the buffer
+                samples = self._samples
+                self._quantiles = [P2Quantile(p, samples[:5]) for p in self.PERCENTILES]
+                for v in samples[5:]:
+                    for est in self._quantiles:
+                        est.add(v)
+                self._samples = None
+    
+    def quantile(self, p):
+        if self._quantiles is not None:
+            return self._quantiles[self.PERCENTILES.index(p)].value()
+        ordered = sorted(self._samples)
+        return ordered[int(len(ordered) * p)]
+    
+    def summary(self):
+        """Same layout as latency_summary()"""
+        return {
+            'count': self.count,
+            'min_ms': round(self.min, 2),
+            'max_ms': round(self.max, 2),
+            'avg_ms': round(self.mean, 2),
+            'median_ms': round(self.quantile(0.5), 2),
+            'p95_ms': round(self.quantile(0.95), 2),
+        }
+
+class ExecutionAggregator:
+    """
+    Fused single-pass JSONL aggregation: event counts, rejection reasons,
+    latency summary, symbol set and time range are all updated per entry,
+    so memory is O(symbols + reasons) rather than O(events).
+    """
+    __slots__ = ('exec_sent', 'exec_rejected', 'rejection_reasons', 'latencies',
+                 'symbols', 'start_ts', 'end_ts')
+    
+    def __init__(self):
+        self.exec_sent = 0
+        self.exec_rejected = 0
+        self.rejection_reasons = Counter()
+        self.latencies = LatencyAccumulator()
+        self.symbols = set()
+        self.start_ts = None
+        self.end_ts = None
+    
+    def add(self, entry):
+        self.update((entry,))
+    
+    def update(self, entries):
+        """Fold an iterable of entries into the running aggregates"""
+        rejection_reasons = self.rejection_reasons
+        add_latency = self.latencies.add
+        add_symbol = self.symbols.add
+        sent, rejected = self.exec_sent, self.exec_rejected
+        start_ts, end_ts = self.start_ts, self.end_ts
+        
+        for entry in entries:
+            get = entry.get
+            event_type = get('event_type')
+            if event_type == 'EXEC_SENT':
+                sent += 1
+            elif event_type == 'EXEC_REJECTED':
+                rejected += 1
+                reason = get('rejection_reason')
+                if reason:
+                    rejection_reasons[reason] += 1
+            
+            latency = get('latency_ms')
+            if latency is not None:
+                add_latency(latency)
+            
+            if 'symbol' in entry:
+                add_symbol(entry['symbol'])
+            
+            # ISO-8601 strings order lexicographically
+            ts = get('ts')
+            if ts:
+                if start_ts is None or ts < start_ts:
+                    start_ts = ts
+                if end_ts is None or ts > end_ts:
+                    end_ts = ts
+        
+        self.exec_sent, self.exec_rejected = sent, rejected
+        self.start_ts, self.end_ts = start_ts, end_ts
+    
+    def finalize(self):
+        """Stats dict in the layout compute_metrics() expects"""
+        return {
+            'exec_sent': self.exec_sent,
+            'exec_rejected': self.exec_rejected,
+            'rejection_reasons': self.rejection_reasons,
+            'latencies': self.latencies,
+            'symbols': self.symbols,
+            'start_ts': self.start_ts,
+            'end_ts': self.end_ts,
+        }
+
+def _iter_mmap_lines(path):
+    """Yield the lines of a file (without b'\\n') from a read-only memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            find = mm.find
+            start = 0
+            end = len(mm)
+            while start < end:
+                nl = find(b'\n', start)
+                if nl == -1:
+                    yield mm[start:end]
+                    break
+                yield mm[start:nl]
+                start = nl + 1
+
+def _iter_entry_batches(lines, batch_size=PARSE_BATCH_SIZE):
+    """Yield lists of parsed JSONL entries, warning on lines that fail to parse"""
+    batch = []
+    for line_num, line in enumerate(lines, 1):
+        try:
+            batch.append(json_loads(line))
+        except ValueError as e:  # JSONDecodeError (stdlib/orjson) or bad UTF-8
+            print(f"[WARN] Invalid JSON at line {line_num}: {e}")
+            continue
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 def analyze_jsonl(jsonl_file):
     """Analyze JSONL log file"""
     if not Path(jsonl_file).exists():
         print(f"[ERROR] JSONL file not found: {jsonl_file}")
         return None
     
-    stats = {
-        'exec_sent': 0,
-        'exec_rejected': 0,
-        'rejection_reasons': defaultdict(int),
-        'latencies': [],
-        'symbols': set(),
-        'timestamps': []
-    }
+    aggregator = ExecutionAggregator()
     
     try:
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                try:
-                    entry = json.loads(line)
-                    
-                    if entry.get('event_type') == 'EXEC_SENT':
-                        stats['exec_sent'] += 1
-                    elif entry.get('event_type') == 'EXEC_REJECTED':
-                        stats['exec_rejected'] += 1
-                        reason = entry.get('rejection_reason')
-                        if reason:
-                            stats['rejection_reasons'][reason] += 1
-                    
-                    # Collect latency
-                    if 'latency_ms' in entry and entry['latency_ms'] is not None:
-                        stats['latencies'].append(entry['latency_ms'])
-                    
-                    # Collect symbol
-                    if 'symbol' in entry:
-                        stats['symbols'].add(entry['symbol'])
-                    
-                    # Collect timestamp
-                    if 'ts' in entry:
-                        stats['timestamps'].append(entry['ts'])
-                
-                except json.JSONDecodeError as e:
-                    print(f"[WARN] Invalid JSON at line {line_num}: {e}")
-                    continue
-        
-        return stats
+        for batch in _iter_entry_batches(_iter_mmap_lines(jsonl_file)):
+            aggregator.update(batch)
+        return aggregator.finalize()
     except Exception as e:
         print(f"[ERROR] Failed to read JSONL: {e}")
         return None
@@ -77,38 +290,62 @@ def analyze_db(db_file):
     
     try:
         conn = sqlite3.connect(db_file)
-        conn.row_factory = sqlite3.Row
         
         stats = {
             'exec_sent': 0,
             'exec_rejected': 0,
             'rejection_reasons': defaultdict(int),
-            'latencies': [],
+            'latencies': array('d'),
             'symbols': set(),
         }
         
-        # Query execution_log
-        cursor = conn.execute(
-            "SELECT decision, rejection_reason, latency_ms, symbol FROM execution_log WHERE module='APP32'"
-        )
+        # Index for the module filter below (skipped if the DB is read-only/locked)
+        try:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_execlog_module ON execution_log(module)")
+        except sqlite3.OperationalError as e:
+            print(f"[WARN] Skipped index creation: {e}")
         
-        for row in cursor:
-            decision = row['decision']
+        # One read transaction so every query below sees the same snapshot
+        conn.execute("BEGIN")
+        
+        # Counts are aggregated by SQLite; only the group rows reach Python
+        for decision, count in conn.execute(
+            "SELECT decision, COUNT(*) FROM execution_log WHERE module='APP32' GROUP BY decision"
+        ):
             if decision == 'SENT':
-                stats['exec_sent'] += 1
+                stats['exec_sent'] = count
             elif decision == 'REJECTED':
-                stats['exec_rejected'] += 1
-                reason = row['rejection_reason']
-                if reason:
-                    stats['rejection_reasons'][reason] += 1
-            
-            # Collect latency
-            if row['latency_ms'] is not None:
-                stats['latencies'].append(row['latency_ms'])
-            
-            # Collect symbol
-            if row['symbol']:
-                stats['symbols'].add(row['symbol'])
+                stats['exec_rejected'] = count
+        
+        # First-seen order, like the previous row-by-row tally
+        for reason, count in conn.execute(
+            "SELECT rejection_reason, COUNT(*) FROM execution_log "
+            "WHERE module='APP32' AND decision='REJECTED' AND rejection_reason IS NOT NULL AND rejection_reason != '' "
+            "GROUP BY rejection_reason ORDER BY MIN(id)"
+        ):
+            stats['rejection_reasons'][reason] = count
+        
+        stats['symbols'].update(symbol for (symbol,) in conn.execute(
+            "SELECT DISTINCT symbol FROM execution_log WHERE module='APP32' AND symbol IS NOT NULL AND symbol != ''"
+        ))
+        
+        # Latencies are the only per-row data; stream them in batches
+        cursor = conn.execute(
+            "SELECT latency_ms FROM execution_log WHERE module='APP32' AND latency_ms IS NOT NULL"
+        )
+        cursor.arraysize = DB_FETCH_SIZE
+        if np is not None:
+            # Row count is known up front, so fill one preallocated float64 array
+            (latency_count,) = conn.execute(
+                "SELECT COUNT(*) FROM execution_log WHERE module='APP32' AND latency_ms IS NOT NULL"
+            ).fetchone()
+            stats['latencies'] = np.fromiter(
+                (latency for rows in iter(cursor.fetchmany, []) for (latency,) in rows),
+                dtype=np.float64, count=latency_count,
+            )
+        else:
+            for rows in iter(cursor.fetchmany, []):
+                stats['latencies'].extend(latency for (latency,) in rows)
         
         conn.close()
         return stats
@@ -141,19 +378,41 @@ def compute_metrics(stats):
     }
     
     # Latency statistics
-    if stats['latencies']:
-        latencies = sorted(stats['latencies'])
-        metrics['latency_stats'] = {
-            'count': len(latencies),
-            'min_ms': round(latencies[0], 2),
-            'max_ms': round(latencies[-1], 2),
-            'avg_ms': round(sum(latencies) / len(latencies), 2),
-            'median_ms': round(latencies[len(latencies)//2], 2),
-            'p95_ms': round(latencies[int(len(latencies) * 0.95)], 2) if len(latencies) > 1 else round(latencies[0], 2),
-        }
+    latencies = stats['latencies']
+    if len(latencies):
+        if isinstance(latencies, LatencyAccumulator):
+            metrics['latency_stats'] = latencies.summary()
+        else:
+            metrics['latency_stats'] = latency_summary(latencies)
     
     return metrics
 
+def latency_summary(latencies):
+    """Compute count/min/max/avg/median/p95 of a non-empty latency sample"""
+    n = len(latencies)
+    mid = n // 2
+    p95 = int(n * 0.95)
+    
+    if np is not None:
+        arr = np.asarray(latencies, dtype=np.float64)
+        # mean/min/max in one fused pass; partial selection for the two ranks
+        avg, mn, mx = latency_moments(arr)
+        part = np.partition(arr, (mid, p95))
+        med, p95_v = float(part[mid]), float(part[p95])
+    else:
+        ordered = sorted(latencies)
+        mn, med, p95_v, mx = ordered[0], ordered[mid], ordered[p95], ordered[-1]
+        avg = sum(ordered) / n
+    
+    return {
+        'count': n,
+        'min_ms': round(mn, 2),
+        'max_ms': round(mx, 2),
+        'avg_ms': round(avg, 2),
+        'median_ms': round(med, 2),
+        'p95_ms': round(p95_v, 2),
+    }
+
 def print_report(metrics):
     """Print formatted analysis report"""
     print("\n" + "="*70)
@@ -171,9 +430,15 @@ def print_report(metrics):
     print(f"  Symbols Involved:     {', '.join(sorted(metrics['symbols']))}")
     
     # Rejection breakdown
+    # Sorted once; reused for the TTL_EXPIRED top-1 check below
+    reasons = metrics['rejection_reasons']
+    if len(reasons) > 1:
+        sorted_reasons = sorted(reasons.items(), key=itemgetter(1), reverse=True)
+    else:
+        sorted_reasons = list(reasons.items())
+    
     print(f"\n[REJECTION BREAKDOWN]")
-    if metrics['rejection_reasons']:
-        sorted_reasons = sorted(metrics['rejection_reasons'].items(), key=lambda x: x[1], reverse=True)
+    if sorted_reasons:
         for rank, (reason, count) in enumerate(sorted_reasons, 1):
             pct = (count / metrics['exec_rejected'] * 100) if metrics['exec_rejected'] > 0 else 0
             print(f"  {rank}. {reason:20} {count:6} ({pct:5.1f}%)")
@@ -196,12 +461,10 @@ def print_report(metrics):
     print(f"\n[SUCCESS CRITERIA CHECK]")
     send_rate = metrics['send_rate']
     ttl_expired_pct = 0
-    if metrics['rejection_reasons']:
-        ttl_count = metrics['rejection_reasons'].get('TTL_EXPIRED', 0)
+    if sorted_reasons:
+        ttl_count = reasons.get('TTL_EXPIRED', 0)
         ttl_expired_pct = (ttl_count / metrics['exec_rejected'] * 100) if metrics['exec_rejected'] > 0 else 0
-        ttl_top1 = list(sorted(metrics['rejection_reasons'].items(), key=lambda x: x[1], reverse=True))[0][0] == 'TTL_EXPIRED'
-    else:
-        ttl_top1 = False
+    ttl_top1 = bool(sorted_reasons) and sorted_reasons[0][0] == 'TTL_EXPIRED'
     
     # Criteria 1: Send rate >= 30%
     crit1_pass = send_rate >= 30
@@ -20,15 +20,239 @@ Output:
 - CSV files: metrics.csv, rejection_analysis.csv, aggressiveness_index.csv
 """
 
+import csv
+import hashlib
 import json
+import mmap
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from multiprocessing import Pool, cpu_count
+from operator import itemgetter
 from statistics import mean, stdev
 
-def load_jsonl_files(logs_dir):
-    """Load all .jsonl files from logs directory"""
+# orjson parses bytes directly and is several times faster than stdlib json;
+# fall back to stdlib json (which also accepts bytes) when it is not installed.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# pandas (optional) moves the per-event counting loop into vectorized
+# value_counts/groupby code for large log corpora.
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# pyarrow (optional) caches parsed events as Parquet between runs
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# ciso8601 (optional) parses ISO-8601 timestamps, trailing 'Z' included, in C
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    def _parse_iso(ts):
+        return datetime.fromisoformat(ts.replace('Z', '+00:00'))
+
+# Helper modules next to this script must import regardless of the caller's cwd
+_TOOLS_DIR = str(Path(__file__).resolve().parent)
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
+
+# Cython build of the tally loop (optional): cythonize -i tools/_analyze_events.pyx
+try:
+    from _analyze_events import tally_events as _tally_events_ext
+except ImportError:
+    _tally_events_ext = None
+
+# Below this many events building a DataFrame costs more than the plain loop
+VECTORIZE_MIN_EVENTS = 10000
+
+# Report tables at least this long are written with pandas' C CSV writer
+CSV_PANDAS_MIN_ROWS = 1000
+
+# event_type -> per_symbol/per_version counter key
+_COUNTER_KEYS = {
+    'SIGNAL_CREATED': 'created',
+    'EXEC_SENT': 'sent',
+    'EXEC_REJECTED': 'rejected',
+}
+
+# Defaults applied to missing event fields (same as the event.get() defaults)
+_FIELD_DEFAULTS = {
+    'event_type': '',
+    'symbol': 'UNKNOWN',
+    'action': '',
+    'ai_score': 0,
+    'params_version_id': 'UNKNOWN',
+    'ts': '',
+    'rejection_reason': 'UNKNOWN',
+}
+
+_get_event_fields = itemgetter('event_type', 'symbol', 'action', 'ai_score', 'params_version_id', 'ts')
+
+# Number of log files read ahead concurrently. File reads release the GIL,
+# so overlapping them hides per-file open/read latency on cold caches.
+READ_AHEAD_FILES = 8
+
+# Parse files in a process pool from this many files up; below it the pool
+# start-up cost outweighs the parallel parse.
+PARALLEL_MIN_FILES = 4
+
+# Byte markers of the event types analyze_events() counts. With --relevant-only,
+# lines containing none of them are skipped before JSON parsing; total_events
+# and the time window then cover only these events.
+RELEVANT_EVENT_MARKERS = (b'SIGNAL_CREATED', b'INTENT_INSERTED', b'EXEC_SENT', b'EXEC_REJECTED')
+
+def _read_file(path):
+    """Read one log file as raw bytes"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _iter_file_bytes(paths, depth=READ_AHEAD_FILES):
+    """Yield (path, bytes) in order, keeping up to `depth` reads in flight"""
+    with ThreadPoolExecutor(max_workers=depth) as pool:
+        pending = deque()
+        for path in paths:
+            pending.append((path, pool.submit(_read_file, path)))
+            if len(pending) >= depth:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+        while pending:
+            done_path, future = pending.popleft()
+            yield done_path, future.result()
+
+def _iter_lines(buf):
+    """
+    Yield the lines of a bytes/mmap buffer, split on b'\\n' only (without it).
+    Both load paths use this so a file splits the same way however many
+    files are loaded (bytes.splitlines() would also split on a lone b'\\r').
+    """
+    find = buf.find
+    start = 0
+    end = len(buf)
+    while start < end:
+        nl = find(b'\n', start)
+        if nl == -1:
+            yield buf[start:end]
+            break
+        yield buf[start:nl]
+        start = nl + 1
+
+def _iter_mmap_lines(path):
+    """Yield the lines of a file (without b'\\n') from a read-only memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield from _iter_lines(mm)
+
+def _parse_lines(lines, file_name, markers=None):
+    """Parse JSONL lines (bytes); returns (events, warning messages)"""
+    events = []
+    warnings = []
+    for line in lines:
+        if markers is not None and not any(marker in line for marker in markers):
+            continue
+        if line.strip():
+            try:
+                events.append(json_loads(line))
+            except ValueError as e:  # JSONDecodeError (stdlib/orjson) or bad UTF-8
+                warnings.append(f"[WARN] Failed to parse line in {file_name}: {e}")
+    return events, warnings
+
+def _parse_file(path, markers=None):
+    """Read and parse one .jsonl file (worker entry point for the process pool)"""
+    return _parse_lines(_iter_mmap_lines(path), Path(path).name, markers)
+
+# Event value types that come back unchanged from a native Parquet column
+_CACHE_SCALAR_TYPES = (str, int, float, bool)
+
+# Schema metadata key listing the columns stored as JSON text
+_CACHE_JSON_COLUMNS = b'json_columns'
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+def _cache_path(cache_dir, jsonl_files, markers):
+    """Parquet cache file keyed by every source file's (name, mtime_ns, size)"""
+    key = hashlib.sha1()
+    for path in jsonl_files:
+        st = path.stat()
+        key.update(f"{path.name}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    key.update(repr(markers).encode())
+    return Path(cache_dir) / f"events_{key.hexdigest()[:16]}.parquet"
+
+def _cache_columns(events):
+    """
+    Map each event key (first-seen order) to True if its values must be stored
+    as JSON text (nested, null, mixed-type or beyond int64), False if a native
+    column reads back unchanged; None if some event is not a JSON object
+    """
+    key_types = {}
+    json_keys = set()
+    for event in events:
+        if type(event) is not dict:
+            return None
+        for key, value in event.items():
+            value_type = type(value)
+            if key_types.setdefault(key, value_type) is not value_type or value_type not in _CACHE_SCALAR_TYPES:
+                json_keys.add(key)
+            elif value_type is int and not _INT64_MIN <= value <= _INT64_MAX:
+                json_keys.add(key)
+    return {key: key in json_keys for key in key_types}
+
+def _read_event_cache(cache_file):
+    """Load cached events; columns an event did not have come back as None"""
+    table = pq.read_table(cache_file)
+    metadata = table.schema.metadata or {}
+    json_columns = set(json.loads(metadata.get(_CACHE_JSON_COLUMNS, b'[]')))
+    events = []
+    for row in table.to_pylist():
+        event = {}
+        for key, value in row.items():
+            if value is not None:
+                event[key] = json.loads(value) if key in json_columns else value
+        events.append(event)
+    return events
+
+def _write_event_cache(cache_file, events, columns):
+    """Store events as zstd Parquet, replacing older cache files"""
+    cache_dir = cache_file.parent
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+    data = {}
+    for key, as_json in columns.items():
+        if as_json:
+            # Missing keys stay Arrow nulls; an explicit null becomes 'null'
+            data[key] = [json.dumps(event[key]) if key in event else None for event in events]
+        else:
+            data[key] = [event.get(key) for event in events]
+    json_columns = [key for key, as_json in columns.items() if as_json]
+    table = pa.Table.from_pydict(data, metadata={_CACHE_JSON_COLUMNS: json.dumps(json_columns)})
+    pq.write_table(table, tmp_file, compression='zstd')
+    os.replace(tmp_file, cache_file)
+    for stale in cache_dir.glob("events_*.parquet"):
+        if stale != cache_file:
+            stale.unlink()
+
+def load_jsonl_files(logs_dir, markers=None, cache_dir=None):
+    """
+    Load all .jsonl files from logs directory (optionally prefiltered by byte
+    markers). With cache_dir and pyarrow available, parsed events are reused
+    from a Parquet cache while no log file has changed.
+    """
     logs_path = Path(logs_dir)
     logs_path.mkdir(parents=True, exist_ok=True)
     
@@ -39,23 +263,53 @@ def load_jsonl_files(logs_dir):
         print(f"[INFO] No .jsonl files found in {logs_path}")
         return all_events
     
-    for jsonl_file in sorted(jsonl_files):
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        event = json.loads(line)
-                        all_events.append(event)
-                    except json.JSONDecodeError as e:
-                        print(f"[WARN] Failed to parse line in {jsonl_file.name}: {e}")
+    jsonl_files.sort()
+    
+    cache_file = None
+    if cache_dir is not None and pq is None:
+        print("[INFO] pyarrow not installed; event cache disabled", file=sys.stderr)
+    elif cache_dir is not None:
+        cache_file = _cache_path(cache_dir, jsonl_files, markers)
+        if cache_file.exists():
+            try:
+                return _read_event_cache(cache_file)
+            except (pa.ArrowException, OSError) as e:
+                print(f"[WARN] Ignoring unreadable event cache {cache_file.name}: {e}")
+    
+    workers = min(cpu_count(), len(jsonl_files))
+    
+    if len(jsonl_files) >= PARALLEL_MIN_FILES and workers > 1:
+        # JSON parsing holds the GIL, so fan files out to processes
+        with Pool(workers) as pool:
+            parsed = pool.imap(partial(_parse_file, markers=markers), jsonl_files)
+            for events, warnings in parsed:
+                for warning in warnings:
+                    print(warning)
+                all_events.extend(events)
+    else:
+        for jsonl_file, data in _iter_file_bytes(jsonl_files):
+            events, warnings = _parse_lines(_iter_lines(data), jsonl_file.name, markers)
+            for warning in warnings:
+                print(warning)
+            all_events.extend(events)
+    
+    # Nested, null or mixed-type fields are cached as JSON text columns so
+    # every event reads back identically
+    columns = _cache_columns(all_events) if cache_file is not None and all_events else None
+    if cache_file is not None and all_events and columns is None:
+        print("[INFO] Event cache skipped: log contains non-object JSON lines", file=sys.stderr)
+    elif columns:
+        try:
+            _write_event_cache(cache_file, all_events, columns)
+        except (pa.ArrowException, OSError) as e:
+            print(f"[WARN] Could not write event cache: {e}")
     
     return all_events
 
-def analyze_events(events):
-    """Analyze all events and return metrics"""
-    
-    metrics = {
-        'total_events': len(events),
+def _empty_metrics(total_events):
+    """Initial metrics layout shared by both analyze_events() paths"""
+    return {
+        'total_events': total_events,
         'signal_created_count': 0,
         'intent_inserted_count': 0,
         'exec_sent_count': 0,
@@ -72,14 +326,33 @@ def analyze_events(events):
         'start_ts': None,
         'end_ts': None,
     }
+
+def analyze_events(events):
+    """Analyze all events and return metrics"""
+    if pd is not None and len(events) >= VECTORIZE_MIN_EVENTS:
+        return _analyze_events_vectorized(events)
+    
+    metrics = _empty_metrics(len(events))
+    (_tally_events_ext or _tally_events)(events, metrics)
+    return metrics
+
+def _tally_events(events, metrics):
+    """Per-event counting loop; fills metrics in place"""
+    # Flat per-key tallies; reassembled into per_symbol/per_version below
+    sym_created, sym_sent, sym_rejected = Counter(), Counter(), Counter()
+    ver_created, ver_sent, ver_rejected = Counter(), Counter(), Counter()
     
     for event in events:
-        event_type = event.get('event_type', '')
-        symbol = event.get('symbol', 'UNKNOWN')
-        action = event.get('action', '')
-        ai_score = event.get('ai_score', 0)
-        params_version_id = event.get('params_version_id', 'UNKNOWN')
-        ts = event.get('ts', '')
+        try:
+            # Well-formed events: one C-level call for all six fields
+            event_type, symbol, action, ai_score, params_version_id, ts = _get_event_fields(event)
+        except KeyError:
+            event_type = event.get('event_type', '')
+            symbol = event.get('symbol', 'UNKNOWN')
+            action = event.get('action', '')
+            ai_score = event.get('ai_score', 0)
+            params_version_id = event.get('params_version_id', 'UNKNOWN')
+            ts = event.get('ts', '')
         
         # Track time range
         if ts:
@@ -93,16 +366,16 @@ def analyze_events(events):
         
         if event_type == 'SIGNAL_CREATED':
             metrics['signal_created_count'] += 1
-            metrics['per_symbol'][symbol]['created'] += 1
-            metrics['per_version'][params_version_id]['created'] += 1
+            sym_created[symbol] += 1
+            ver_created[params_version_id] += 1
             
         elif event_type == 'INTENT_INSERTED':
             metrics['intent_inserted_count'] += 1
             
         elif event_type == 'EXEC_SENT':
             metrics['exec_sent_count'] += 1
-            metrics['per_symbol'][symbol]['sent'] += 1
-            metrics['per_version'][params_version_id]['sent'] += 1
+            sym_sent[symbol] += 1
+            ver_sent[params_version_id] += 1
             metrics['ai_scores_sent'].append(ai_score)
             
             if action == 'BUY':
@@ -112,14 +385,75 @@ def analyze_events(events):
             
         elif event_type == 'EXEC_REJECTED':
             metrics['exec_rejected_count'] += 1
-            metrics['per_symbol'][symbol]['rejected'] += 1
-            metrics['per_version'][params_version_id]['rejected'] += 1
+            sym_rejected[symbol] += 1
+            ver_rejected[params_version_id] += 1
             metrics['ai_scores_rejected'].append(ai_score)
             
             rejection_reason = event.get('rejection_reason', 'UNKNOWN')
             metrics['rejection_reasons'][rejection_reason] += 1
             metrics['per_rejection_reason'][rejection_reason] += 1
     
+    _merge_tallies(metrics['per_symbol'], sym_created, sym_sent, sym_rejected)
+    _merge_tallies(metrics['per_version'], ver_created, ver_sent, ver_rejected)
+
+def _merge_tallies(target, created, sent, rejected):
+    """Fill target[key] = {'created', 'sent', 'rejected'} from three Counters"""
+    for key in created.keys() | sent.keys() | rejected.keys():
+        target[key] = {'created': created[key], 'sent': sent[key], 'rejected': rejected[key]}
+
+def _group_key(key):
+    """groupby(dropna=False) reports a None key as NaN; map it back to None"""
+    return None if key != key else key
+
+def _analyze_events_vectorized(events):
+    """analyze_events() over a pandas DataFrame; returns the same metrics layout"""
+    metrics = _empty_metrics(len(events))
+    
+    # Same semantics as the loop's event.get(key, default): defaults fill
+    # missing keys only, explicit nulls stay None; object dtype keeps values
+    # (int vs float ai_score, None) exactly as parsed
+    df = pd.DataFrame(
+        {key: [event.get(key, default) for event in events] for key, default in _FIELD_DEFAULTS.items()},
+        dtype=object,
+    )
+    event_type = df['event_type']
+    
+    # Track time range (falsy ts skipped, as in the loop)
+    ts = df['ts'][df['ts'].astype(bool)]
+    if not ts.empty:
+        metrics['start_ts'] = ts.min()
+        metrics['end_ts'] = ts.max()
+    
+    # Events by type (original event dicts, in log order)
+    for et, idx in df.groupby('event_type', sort=False, dropna=False).indices.items():
+        metrics['events_by_type'][_group_key(et)] = [events[i] for i in idx]
+    
+    counts = event_type.value_counts()
+    metrics['signal_created_count'] = int(counts.get('SIGNAL_CREATED', 0))
+    metrics['intent_inserted_count'] = int(counts.get('INTENT_INSERTED', 0))
+    metrics['exec_sent_count'] = int(counts.get('EXEC_SENT', 0))
+    metrics['exec_rejected_count'] = int(counts.get('EXEC_REJECTED', 0))
+    
+    sent = df[event_type == 'EXEC_SENT']
+    rejected = df[event_type == 'EXEC_REJECTED']
+    metrics['ai_scores_sent'] = sent['ai_score'].tolist()
+    metrics['ai_scores_rejected'] = rejected['ai_score'].tolist()
+    
+    actions = sent['action'].value_counts()
+    metrics['buy_actions'] = int(actions.get('BUY', 0))
+    metrics['sell_actions'] = int(actions.get('SELL', 0))
+    
+    # sort=False keeps first-seen order, matching the loop version
+    for reason, count in rejected['rejection_reason'].value_counts(sort=False, dropna=False).items():
+        metrics['rejection_reasons'][reason] = int(count)
+        metrics['per_rejection_reason'][reason] = int(count)
+    
+    tracked = df[event_type.isin(_COUNTER_KEYS)]
+    kind = tracked['event_type'].map(_COUNTER_KEYS)
+    for column, key in (('symbol', 'per_symbol'), ('params_version_id', 'per_version')):
+        for (name, k), count in tracked.groupby([tracked[column], kind], sort=False, dropna=False).size().items():
+            metrics[key][_group_key(name)][k] = int(count)
+    
     return metrics
 
 def calculate_aggressiveness_index(metrics):
@@ -133,8 +467,8 @@ def calculate_aggressiveness_index(metrics):
     # Variant 1: Intents inserted per minute
     if metrics['start_ts'] and metrics['end_ts']:
         try:
-            start = datetime.fromisoformat(metrics['start_ts'].replace('Z', '+00:00'))
-            end = datetime.fromisoformat(metrics['end_ts'].replace('Z', '+00:00'))
+            start = _parse_iso(metrics['start_ts'])
+            end = _parse_iso(metrics['end_ts'])
             elapsed_seconds = (end - start).total_seconds()
             elapsed_minutes = elapsed_seconds / 60.0 if elapsed_seconds > 0 else 1.0
             
@@ -252,83 +586,97 @@ def print_summary(metrics, agg_metrics):
     
     print("\n" + "="*70)
 
+def _write_csv(f, header, rows):
+    """Write header + rows to an open text file (same output from both writers)"""
+    if pd is not None and len(rows) >= CSV_PANDAS_MIN_ROWS:
+        pd.DataFrame(rows, columns=header).to_csv(f, index=False, lineterminator='\n')
+    else:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(rows)
+
 def export_csv_metrics(metrics, agg_metrics, output_dir):
     """Export metrics to CSV files"""
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
     # Main metrics CSV
-    metrics_file = output_path / "metrics.csv"
-    with open(metrics_file, 'w', encoding='utf-8') as f:
-        f.write("metric_name,value\n")
-        f.write(f"total_events,{metrics['total_events']}\n")
-        f.write(f"signal_created,{metrics['signal_created_count']}\n")
-        f.write(f"intent_inserted,{metrics['intent_inserted_count']}\n")
-        f.write(f"exec_sent,{metrics['exec_sent_count']}\n")
-        f.write(f"exec_rejected,{metrics['exec_rejected_count']}\n")
-        
-        if metrics['signal_created_count'] > 0:
-            sent_rate = metrics['exec_sent_count'] / metrics['signal_created_count'] * 100
-            rejected_rate = metrics['exec_rejected_count'] / metrics['signal_created_count'] * 100
-        else:
-            sent_rate = rejected_rate = 0
-        
-        f.write(f"sent_rate_percent,{sent_rate:.2f}\n")
-        f.write(f"rejected_rate_percent,{rejected_rate:.2f}\n")
-        f.write(f"buy_actions,{metrics['buy_actions']}\n")
-        f.write(f"sell_actions,{metrics['sell_actions']}\n")
-        
-        if metrics['ai_scores_sent']:
-            f.write(f"ai_score_sent_mean,{mean(metrics['ai_scores_sent']):.4f}\n")
-        if metrics['ai_scores_rejected']:
-            f.write(f"ai_score_rejected_mean,{mean(metrics['ai_scores_rejected']):.4f}\n")
+    if metrics['signal_created_count'] > 0:
+        sent_rate = metrics['exec_sent_count'] / metrics['signal_created_count'] * 100
+        rejected_rate = metrics['exec_rejected_count'] / metrics['signal_created_count'] * 100
+    else:
+        sent_rate = rejected_rate = 0
     
-    print(f"[EXPORT] {metrics_file}")
+    metric_rows = [
+        ('total_events', metrics['total_events']),
+        ('signal_created', metrics['signal_created_count']),
+        ('intent_inserted', metrics['intent_inserted_count']),
+        ('exec_sent', metrics['exec_sent_count']),
+        ('exec_rejected', metrics['exec_rejected_count']),
+        ('sent_rate_percent', f"{sent_rate:.2f}"),
+        ('rejected_rate_percent', f"{rejected_rate:.2f}"),
+        ('buy_actions', metrics['buy_actions']),
+        ('sell_actions', metrics['sell_actions']),
+    ]
+    if metrics['ai_scores_sent']:
+        metric_rows.append(('ai_score_sent_mean', f"{mean(metrics['ai_scores_sent']):.4f}"))
+    if metrics['ai_scores_rejected']:
+        metric_rows.append(('ai_score_rejected_mean', f"{mean(metrics['ai_scores_rejected']):.4f}"))
     
     # Rejection Analysis CSV
-    rejection_file = output_path / "rejection_analysis.csv"
-    with open(rejection_file, 'w', encoding='utf-8') as f:
-        f.write("rejection_reason,count,percentage\n")
-        total_rejected = metrics['exec_rejected_count']
-        for reason in sorted(metrics['rejection_reasons'].keys()):
-            count = metrics['rejection_reasons'][reason]
-            pct = count / total_rejected * 100 if total_rejected > 0 else 0
-            f.write(f"{reason},{count},{pct:.2f}\n")
-    
-    print(f"[EXPORT] {rejection_file}")
+    total_rejected = metrics['exec_rejected_count']
+    rejection_rows = []
+    for reason in sorted(metrics['rejection_reasons'].keys()):
+        count = metrics['rejection_reasons'][reason]
+        pct = count / total_rejected * 100 if total_rejected > 0 else 0
+        rejection_rows.append((reason, count, f"{pct:.2f}"))
     
     # Aggressiveness Index CSV
-    agg_file = output_path / "aggressiveness_index.csv"
-    with open(agg_file, 'w', encoding='utf-8') as f:
-        f.write("metric,value\n")
-        f.write(f"time_window_minutes,{agg_metrics['elapsed_minutes']:.2f}\n")
-        f.write(f"intents_per_minute,{agg_metrics['intents_per_minute']:.4f}\n")
-        f.write(f"buy_ratio,{agg_metrics['buy_ratio']:.4f}\n")
-        f.write(f"aggressiveness_score,{agg_metrics['aggressiveness_score']:.2f}\n")
-    
-    print(f"[EXPORT] {agg_file}")
-    
-    # Per-Symbol CSV
-    symbol_file = output_path / "per_symbol.csv"
-    with open(symbol_file, 'w', encoding='utf-8') as f:
-        f.write("symbol,created,sent,rejected\n")
-        for symbol in sorted(metrics['per_symbol'].keys()):
-            stats = metrics['per_symbol'][symbol]
-            f.write(f"{symbol},{stats['created']},{stats['sent']},{stats['rejected']}\n")
-    
-    print(f"[EXPORT] {symbol_file}")
-    
-    # Per-Version CSV
-    version_file = output_path / "per_version.csv"
-    with open(version_file, 'w', encoding='utf-8') as f:
-        f.write("version,created,sent,rejected\n")
-        for version in sorted(metrics['per_version'].keys()):
-            stats = metrics['per_version'][version]
-            f.write(f"{version},{stats['created']},{stats['sent']},{stats['rejected']}\n")
-    
-    print(f"[EXPORT] {version_file}")
+    agg_rows = [
+        ('time_window_minutes', f"{agg_metrics['elapsed_minutes']:.2f}"),
+        ('intents_per_minute', f"{agg_metrics['intents_per_minute']:.4f}"),
+        ('buy_ratio', f"{agg_metrics['buy_ratio']:.4f}"),
+        ('aggressiveness_score', f"{agg_metrics['aggressiveness_score']:.2f}"),
+    ]
+    
+    # Per-Symbol / Per-Version CSV
+    symbol_rows = [
+        (symbol, stats['created'], stats['sent'], stats['rejected'])
+        for symbol, stats in sorted(metrics['per_symbol'].items())
+    ]
+    version_rows = [
+        (version, stats['created'], stats['sent'], stats['rejected'])
+        for version, stats in sorted(metrics['per_version'].items())
+    ]
+    
+    outputs = [
+        (output_path / "metrics.csv", ('metric_name', 'value'), metric_rows),
+        (output_path / "rejection_analysis.csv", ('rejection_reason', 'count', 'percentage'), rejection_rows),
+        (output_path / "aggressiveness_index.csv", ('metric', 'value'), agg_rows),
+        (output_path / "per_symbol.csv", ('symbol', 'created', 'sent', 'rejected'), symbol_rows),
+        (output_path / "per_version.csv", ('version', 'created', 'sent', 'rejected'), version_rows),
+    ]
+    
+    # Write every report to a .tmp sibling first, then swap them into place
+    with ExitStack() as stack:
+        for csv_file, header, rows in outputs:
+            f = stack.enter_context(open(csv_file.with_name(csv_file.name + '.tmp'), 'w', encoding='utf-8'))
+            _write_csv(f, header, rows)
+    
+    for csv_file, _, _ in outputs:
+        os.replace(csv_file.with_name(csv_file.name + '.tmp'), csv_file)
+        print(f"[EXPORT] {csv_file}")
 
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='QUANT-EVO JSON Lines Log Analyzer')
+    parser.add_argument('--relevant-only', action='store_true',
+                        help='skip events other than SIGNAL_CREATED/INTENT_INSERTED/EXEC_* before parsing')
+    parser.add_argument('--cache', action='store_true',
+                        help='reuse parsed events from a Parquet cache in shared/reports/.cache (needs pyarrow)')
+    args = parser.parse_args()
+    
     # Paths
     project_root = Path(__file__).resolve().parents[1]
     logs_dir = project_root / "shared" / "logs"
@@ -340,7 +688,11 @@ def main():
     
     # Load events
     print(f"\n[LOADING]")
-    events = load_jsonl_files(str(logs_dir))
+    events = load_jsonl_files(
+        str(logs_dir),
+        RELEVANT_EVENT_MARKERS if args.relevant_only else None,
+        cache_dir=reports_dir / ".cache" if args.cache else None,
+    )
     print(f"  Loaded {len(events)} events")
     
     if len(events) == 0:
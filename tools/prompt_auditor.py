@@ -12,107 +12,299 @@ QUANT-EVO Prompt Quality Auditor
 - 실계좌/손익 예측 금지 ✅
 - 프롬프트 자동 수정 금지 ✅
 - 조정 제안만 시나리오로 제시 ✅
+
+빌드(선택): 타입 주석이 mypy를 통과하므로 `mypyc tools/prompt_auditor.py`로
+확장 모듈을 만들 수 있음. import 시 .so가 우선 로드되고, 없으면 순수 Python 그대로 동작.
 """
 
-import json
+import calendar
+import math
+import mmap
+import os
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from collections import defaultdict
-from statistics import mean
+from types import MappingProxyType
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Mapping, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+
+# orjson: bytes를 바로 파싱하며 표준 json보다 수 배 빠름
+# 미설치 시 표준 json으로 대체 (표준 json도 bytes 입력 허용)
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads  # type: ignore[assignment]
+
+Event = Dict[str, Any]
+
+# 영향도/심각도 단계 - 임계값 튜플과 bisect로 인덱스 결정
+_IMPACT_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+_SEVERITY_LEVELS = ('CRITICAL', 'HIGH', 'MEDIUM')
+_SEVERITY_THRESHOLDS = (2, 5)  # intents/min
+
+# 이보다 파일이 적으면 프로세스 풀 기동 비용이 파싱 이득보다 큼
+PARALLEL_MIN_FILES = 4
 
-def load_params():
-    """현재 strategy_params.json 로드"""
+@lru_cache(maxsize=4)
+def _load_params_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """mtime별 캐시 - 파일이 수정되면 키가 바뀌어 다시 읽음"""
+    return json_loads(Path(path_str).read_bytes())
+
+def load_params() -> Dict[str, Any]:
+    """현재 strategy_params.json 로드 (같은 파일 재호출 시 캐시 사용; 반환값은 수정하지 말 것)"""
     config_path = Path(__file__).resolve().parents[1] / "shared" / "config" / "strategy_params.json"
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _load_params_cached(str(config_path), config_path.stat().st_mtime_ns)
+
+# 조정 제안 시나리오 템플릿 (값과 무관한 고정 문구) - 호출마다 수치 필드만 채움
+# adjustments: (parameter, delta, rationale 템플릿)
+_SCENARIO_TEMPLATES = (
+    # === Scenario A: 신호 신뢰도 기준(ai_score_cut) 완화 ===
+    MappingProxyType({
+        'name': 'Scenario A: ai_score_cut 완화',
+        'rationale': '신호 신뢰도 기준을 낮춰서 신호 생성 빈도 증가',
+        'settings_key': 'current_setting',
+        'adjustments': (
+            ('ai_score_cut', -0.05, "기준을 {current}에서 {proposed}로 완화"),
+        ),
+        'multiplier': 1.5,
+        'effects': MappingProxyType({
+            'risk': '낮은 신뢰도 신호도 생성 가능 (거절 필터 의존)',
+            'ai_score_impact': '평균 신호 신뢰도 약간 감소',
+        }),
+        'warning': '신호는 많아지지만, 필터링이 더 중요해짐',
+    }),
+    # === Scenario B: 시장 조건 필터 완화 ===
+    MappingProxyType({
+        'name': 'Scenario B: 시장 조건 필터(vol_spike, book_ratio) 완화',
+        'rationale': '시장 변동성/호가 조건을 완화하여 신호 기회 확대',
+        'settings_key': 'current_settings',
+        'adjustments': (
+            ('vol_spike_min', -0.3, "변동성 스파이크 기준 {current}배에서 {proposed}배로 완화"),
+            ('book_ratio_min', -0.1, "호가 레시오 기준 {current}배에서 {proposed}배로 완화"),
+        ),
+        'multiplier': 2.0,
+        'effects': MappingProxyType({
+            'risk': '더 많은 신호가 생성되지만, 시장 조건이 좋지 않을 때도 신호 발생',
+            'filter_impact': 'COOLDOWN/TTL 거절 비율 증가 가능',
+        }),
+        'warning': '완화 폭이 크면 노이즈 신호 증가 가능',
+    }),
+    # === Scenario C: 보수적 접근 - 1단계 완화 ===
+    MappingProxyType({
+        'name': 'Scenario C: 1단계 점진적 완화 (Hybrid)',
+        'rationale': '과도한 변화 피하고, ai_score_cut만 조금 완화',
+        'settings_key': 'current_settings',
+        'adjustments': (
+            ('ai_score_cut', -0.03, "기준을 {current}에서 {proposed}로 보수적으로 완화"),
+        ),
+        'multiplier': 1.2,
+        'effects': MappingProxyType({
+            'risk': '적절한 수준의 신호 증가, 거절 비율은 현재 유지',
+            'benefit': '안정적인 점진적 개선',
+        }),
+        'warning': '제한적 개선이지만, 데이터 수집 후 추가 평가 가능',
+    }),
+)
+
+def _list_jsonl_files(logs_dir: str) -> List[str]:
+    """logs_dir 안의 .jsonl 파일 경로(str)를 이름순으로 반환 (디렉터리가 없으면 빈 목록)"""
+    try:
+        with os.scandir(logs_dir) as it:
+            return sorted(entry.path for entry in it
+                          if entry.name.endswith('.jsonl') and entry.is_file())
+    except FileNotFoundError:
+        return []
+
+def _iter_mmap_lines(path: str) -> Iterator[bytes]:
+    """파일의 각 줄(bytes, b'\n' 제외)을 읽기 전용 mmap에서 yield"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # 빈 파일은 mmap 불가
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # mmap을 지원하지 않는 파일시스템 등 - 통째로 읽어서 mmap 경로와 같이 b'\n' 기준 분할
+            yield from f.read().split(b'\n')
+            return
+        with mm:
+            find = mm.find
+            start = 0
+            end = len(mm)
+            while start < end:
+                nl = find(b'\n', start)
+                if nl == -1:
+                    yield mm[start:end]
+                    break
+                yield mm[start:nl]
+                start = nl + 1
+
+def _iter_file_events(path: str) -> Generator[Event, None, int]:
+    """JSONL 파일 1개의 이벤트를 순서대로 yield - 종료 시 파싱 실패 줄 수를 return"""
+    skipped = 0
+    # 줄을 bytes 그대로 파서에 전달 (UTF-8 디코딩 생략)
+    for line in _iter_mmap_lines(path):
+        # 줄바꿈이 제거된 상태라 빈 줄은 b'' - strip() 사본 없이 판별
+        if line:
+            try:
+                event = json_loads(line)
+            except ValueError:  # JSONDecodeError (stdlib/orjson) 또는 잘못된 UTF-8
+                skipped += 1
+                continue
+            yield event
+    return skipped
 
-def load_jsonl_events(logs_dir):
-    """JSON Lines 로그 로드"""
-    logs_path = Path(logs_dir)
+def _parse_file(path: str) -> Tuple[List[Event], int]:
+    """JSONL 파일 1개 파싱 (프로세스 풀 워커) - (events, 파싱 실패 줄 수)"""
     events = []
-    
-    for jsonl_file in sorted(logs_path.glob("*.jsonl")):
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        events.append(json.loads(line))
-                    except:
-                        pass
-    
-    return events
+    it = _iter_file_events(path)
+    try:
+        while True:
+            events.append(next(it))
+    except StopIteration as stop:
+        return events, stop.value
+
+def load_jsonl_events(logs_dir: str) -> Iterator[Event]:
+    """JSON Lines 로그를 이벤트 단위로 스트리밍 (전체 목록을 메모리에 두지 않음)"""
+    files = _list_jsonl_files(logs_dir)
+    workers = min(os.cpu_count() or 1, len(files))
+    skipped = 0
+    
+    if len(files) < PARALLEL_MIN_FILES or workers < 2:
+        for path in files:
+            skipped += yield from _iter_file_events(path)
+    else:
+        # json 파싱은 GIL을 잡으므로 파일 단위로 프로세스에 분산 (결과는 파일 순서 유지)
+        # 진행 중인 파일을 workers개로 제한: 결과 하나를 소비할 때마다 다음 파일 제출
+        # (pool.map은 전체 파일을 한 번에 제출해 완료된 목록이 메모리에 쌓임)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            remaining = iter(files)
+            for path in remaining:
+                pending.append(pool.submit(_parse_file, path))
+                if len(pending) >= workers:
+                    break
+            while pending:
+                chunk, chunk_skipped = pending.popleft().result()
+                for path in remaining:
+                    pending.append(pool.submit(_parse_file, path))
+                    break
+                skipped += chunk_skipped
+                yield from chunk
+                del chunk
+    
+    if skipped:
+        print(f"⚠️  JSON 파싱 실패로 건너뛴 줄: {skipped}개", file=sys.stderr)
+
+def _parse_ts(ts: str) -> float:
+    """ISO-8601 문자열 → epoch 초 (고정폭 'YYYY-MM-DDTHH:MM:SS[.fff]Z'는 슬라이싱으로 직접 계산)"""
+    if len(ts) >= 20 and ts[-1] == 'Z' and ts[10] == 'T':
+        seconds = calendar.timegm((int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                                   int(ts[11:13]), int(ts[14:16]), int(ts[17:19]), 0, 0, 0))
+        return seconds + float(ts[19:-1]) if len(ts) > 20 else seconds
+    dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
 
-def analyze_prompt_structure(params, events):
+def analyze_prompt_structure(params: Dict[str, Any], events: Iterable[Event]) -> Optional[Dict[str, Any]]:
     """프롬프트 구조 분석 - 신호 생성이 언제/왜 실패하는지"""
     
-    # === Step 1: 신호 생성 빈도 분석 ===
-    signal_created = [e for e in events if e.get('event_type') == 'SIGNAL_CREATED']
-    exec_sent = [e for e in events if e.get('event_type') == 'EXEC_SENT']
-    exec_rejected = [e for e in events if e.get('event_type') == 'EXEC_REJECTED']
-    
-    if not signal_created:
+    # === Step 1: 이벤트 1회 순회로 집계 ===
+    sig_n = sent_n = rej_n = buy_n = 0
+    score_sum = 0.0
+    score_min = math.inf
+    score_max = -math.inf
+    first_signal: Optional[Event] = None
+    last_signal: Optional[Event] = None
+    rejection_reasons: Counter[str] = Counter()
+    
+    for e in events:
+        event_type = e.get('event_type')
+        if event_type == 'SIGNAL_CREATED':
+            sig_n += 1
+            if first_signal is None:
+                first_signal = e
+            last_signal = e
+            
+            score = e.get('ai_score', 0)
+            score_sum += score
+            if score < score_min:
+                score_min = score
+            if score > score_max:
+                score_max = score
+            if e.get('action') == 'BUY':
+                buy_n += 1
+        elif event_type == 'EXEC_SENT':
+            sent_n += 1
+        elif event_type == 'EXEC_REJECTED':
+            rej_n += 1
+            rejection_reasons[e.get('rejection_reason', 'UNKNOWN')] += 1
+    
+    if first_signal is None or last_signal is None:
         return None
     
     # 시간 계산
     try:
-        from datetime import datetime
-        start = datetime.fromisoformat(signal_created[0]['ts'].replace('Z', '+00:00'))
-        end = datetime.fromisoformat(signal_created[-1]['ts'].replace('Z', '+00:00'))
-        elapsed_minutes = (end - start).total_seconds() / 60
+        elapsed_minutes = (_parse_ts(last_signal['ts']) - _parse_ts(first_signal['ts'])) / 60
     except:
-        elapsed_minutes = 1
-    
-    intents_per_minute = len(signal_created) / elapsed_minutes if elapsed_minutes > 0 else 0
+        elapsed_minutes = 1.0
     
-    # === Step 2: 신호 특성 분석 ===
-    ai_scores = [e.get('ai_score', 0) for e in signal_created]
-    buy_signals = sum(1 for e in signal_created if e.get('action') == 'BUY')
-    
-    # === Step 3: 거절 이유 분석 ===
-    rejection_reasons = defaultdict(int)
-    for e in exec_rejected:
-        reason = e.get('rejection_reason', 'UNKNOWN')
-        rejection_reasons[reason] += 1
+    intents_per_minute = sig_n / elapsed_minutes if elapsed_minutes > 0 else 0.0
     
+    # === Step 2: 거절 이유 분석 ===
     # TTL 거절 비율
-    ttl_rejects = rejection_reasons.get('TTL_EXPIRED', 0)
-    ttl_reject_ratio = ttl_rejects / len(exec_rejected) * 100 if exec_rejected else 0
+    ttl_rejects = rejection_reasons['TTL_EXPIRED']
+    ttl_reject_ratio = ttl_rejects / rej_n * 100 if rej_n else 0
     
     # COOLDOWN 거절 비율
-    cooldown_rejects = rejection_reasons.get('COOLDOWN', 0)
-    cooldown_reject_ratio = cooldown_rejects / len(exec_rejected) * 100 if exec_rejected else 0
+    cooldown_rejects = rejection_reasons['COOLDOWN']
+    cooldown_reject_ratio = cooldown_rejects / rej_n * 100 if rej_n else 0
     
     return {
-        'signal_created_count': len(signal_created),
-        'exec_sent_count': len(exec_sent),
-        'exec_rejected_count': len(exec_rejected),
+        'signal_created_count': sig_n,
+        'exec_sent_count': sent_n,
+        'exec_rejected_count': rej_n,
         'intents_per_minute': intents_per_minute,
         'elapsed_minutes': elapsed_minutes,
-        'ai_scores': ai_scores,
-        'ai_score_mean': mean(ai_scores) if ai_scores else 0,
-        'buy_ratio': buy_signals / len(signal_created) if signal_created else 0,
-        'sent_rate': len(exec_sent) / len(signal_created) * 100 if signal_created else 0,
+        'ai_score_mean': score_sum / sig_n,
+        'ai_score_range': score_max - score_min,
+        'buy_ratio': buy_n / sig_n,
+        'sent_rate': sent_n / sig_n * 100,
         'rejection_reasons': dict(rejection_reasons),
+        'rejection_reasons_sorted': sorted(rejection_reasons.items(), key=itemgetter(1), reverse=True),
         'ttl_reject_ratio': ttl_reject_ratio,
         'cooldown_reject_ratio': cooldown_reject_ratio,
     }
 
-def diagnose_low_intents_per_minute(params, analysis):
+def _impact(value: float, thresholds: Tuple[float, ...]) -> str:
+    """value가 초과한 임계값 개수(thresholds 오름차순)로 영향도 결정"""
+    return _IMPACT_LEVELS[bisect_left(thresholds, value)]
+
+def diagnose_low_intents_per_minute(
+    params: Dict[str, Any], analysis: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
     """intents/min이 낮은 원인 진단 - 프롬프트 구조 관점"""
     
     intents_pm = analysis['intents_per_minute']
+    sig = params['signal']
+    uni = params['universe']
     
     # 진단: 어디서 신호 생성이 제한되는가?
     
     diagnostics = {
-        'problem_severity': 'CRITICAL' if intents_pm < 2 else 'HIGH' if intents_pm < 5 else 'MEDIUM',
+        'problem_severity': _SEVERITY_LEVELS[bisect_right(_SEVERITY_THRESHOLDS, intents_pm)],
         'current_rate': intents_pm,
         'target_rate': 10,  # 이상적인 범위의 중간값
         'gap': 10 - intents_pm,
     }
     
     # === Hypothesis 1: ai_score_cut이 너무 높은가? ===
-    ai_score_cut = params['signal']['ai_score_cut']
+    ai_score_cut = sig['ai_score_cut']
     mean_score = analysis['ai_score_mean']
     
     hypothesis_1 = {
@@ -121,16 +313,16 @@ def diagnose_low_intents_per_minute(params, analysis):
         'analysis': {
             'ai_score_cut': ai_score_cut,
             'actual_mean_score': mean_score,
-            'score_variance': max(analysis['ai_scores']) - min(analysis['ai_scores']) if analysis['ai_scores'] else 0,
+            'score_variance': analysis['ai_score_range'],
         },
-        'impact': 'HIGH' if ai_score_cut > mean_score + 0.05 else 'MEDIUM' if ai_score_cut > mean_score else 'LOW',
+        'impact': _impact(ai_score_cut, (mean_score, mean_score + 0.05)),
         'reasoning': f"현재 생성되는 신호의 평균 점수({mean_score:.3f})가 기준({ai_score_cut})보다 낮음. "
                     f"기준이 높으면 신호 생성 자체가 제한됨.",
     }
     
     # === Hypothesis 2: vol_spike_min 또는 book_ratio_min 조건이 과도히 엄격한가? ===
-    vol_spike_min = params['signal'].get('vol_spike_min', 2.0)
-    book_ratio_min = params['signal'].get('book_ratio_min', 1.30)
+    vol_spike_min = sig.get('vol_spike_min', 2.0)
+    book_ratio_min = sig.get('book_ratio_min', 1.30)
     
     hypothesis_2 = {
         'name': '시장 조건 필터 (volatility/book ratio) 과도히 엄격함',
@@ -147,242 +339,222 @@ def diagnose_low_intents_per_minute(params, analysis):
     hypothesis_3 = {
         'name': '프롬프트 로직 자체가 신호 생성을 제한함',
         'analysis': {
-            'price_above_vwap_required': params['signal'].get('require_price_above_vwap', True),
-            'max_symbols': params['universe']['max_symbols'],
-            'window_sec': params['signal'].get('window_sec', 30),
-            'buy_ratio_min': params['signal'].get('buy_ratio_min', 0.65),
+            'price_above_vwap_required': sig.get('require_price_above_vwap', True),
+            'max_symbols': uni['max_symbols'],
+            'window_sec': sig.get('window_sec', 30),
+            'buy_ratio_min': sig.get('buy_ratio_min', 0.65),
         },
         'impact': 'MEDIUM',
-        'reasoning': f"VWAP 이상 가격 요구, 최대 {params['universe']['max_symbols']}개 심볼 등의 조건. "
+        'reasoning': f"VWAP 이상 가격 요구, 최대 {uni['max_symbols']}개 심볼 등의 조건. "
                     f"이들이 복합적으로 신호 기회를 줄임.",
     }
     
     return hypothesis_1, hypothesis_2, hypothesis_3
 
-def propose_adjustment_scenarios(params, analysis, h1, h2, h3):
-    """조정 제안 시나리오 (실제 수정 아님, 제안만)"""
-    
-    scenarios = []
-    
-    # === Scenario A: 신호 신뢰도 기준(ai_score_cut) 완화 ===
-    scenario_a = {
-        'name': 'Scenario A: ai_score_cut 완화',
-        'rationale': '신호 신뢰도 기준을 낮춰서 신호 생성 빈도 증가',
-        'current_setting': {
-            'ai_score_cut': params['signal']['ai_score_cut'],
-        },
-        'proposed_adjustments': [
-            {
-                'parameter': 'ai_score_cut',
-                'current_value': params['signal']['ai_score_cut'],
-                'proposed_value': params['signal']['ai_score_cut'] - 0.05,
-                'rationale': f"기준을 {params['signal']['ai_score_cut']}에서 {params['signal']['ai_score_cut'] - 0.05}로 완화",
-            }
-        ],
-        'expected_effects': {
-            'intents_per_minute': f"예상 증가: {analysis['intents_per_minute']:.2f} → {analysis['intents_per_minute'] * 1.5:.2f}",
-            'risk': '낮은 신뢰도 신호도 생성 가능 (거절 필터 의존)',
-            'ai_score_impact': '평균 신호 신뢰도 약간 감소',
-        },
-        'warning': '신호는 많아지지만, 필터링이 더 중요해짐',
+def _mk_adjustment(parameter: str, current: float, delta: float, reason_tmpl: str) -> Dict[str, Any]:
+    """파라미터 1개 조정 제안 (reason_tmpl의 {current}/{proposed}를 채움)"""
+    proposed = current + delta
+    return {
+        'parameter': parameter,
+        'current_value': current,
+        'proposed_value': proposed,
+        'rationale': reason_tmpl.format_map({'current': current, 'proposed': proposed}),
     }
-    
-    # === Scenario B: 시장 조건 필터 완화 ===
-    scenario_b = {
-        'name': 'Scenario B: 시장 조건 필터(vol_spike, book_ratio) 완화',
-        'rationale': '시장 변동성/호가 조건을 완화하여 신호 기회 확대',
-        'current_settings': {
-            'vol_spike_min': params['signal'].get('vol_spike_min', 2.0),
-            'book_ratio_min': params['signal'].get('book_ratio_min', 1.30),
-        },
-        'proposed_adjustments': [
-            {
-                'parameter': 'vol_spike_min',
-                'current_value': params['signal'].get('vol_spike_min', 2.0),
-                'proposed_value': params['signal'].get('vol_spike_min', 2.0) - 0.3,
-                'rationale': f"변동성 스파이크 기준 {params['signal'].get('vol_spike_min', 2.0)}배에서 {params['signal'].get('vol_spike_min', 2.0) - 0.3}배로 완화",
-            },
-            {
-                'parameter': 'book_ratio_min',
-                'current_value': params['signal'].get('book_ratio_min', 1.30),
-                'proposed_value': params['signal'].get('book_ratio_min', 1.30) - 0.1,
-                'rationale': f"호가 레시오 기준 {params['signal'].get('book_ratio_min', 1.30)}배에서 {params['signal'].get('book_ratio_min', 1.30) - 0.1}배로 완화",
-            }
-        ],
+
+def _mk_scenario(template: Mapping[str, Any], currents: Dict[str, float], intents_pm: float) -> Dict[str, Any]:
+    """템플릿 + 현재 파라미터값(currents)으로 시나리오 dict 구성"""
+    proposed = [
+        _mk_adjustment(parameter, currents[parameter], delta, reason_tmpl)
+        for parameter, delta, reason_tmpl in template['adjustments']
+    ]
+    multiplier = template['multiplier']
+    return {
+        'name': template['name'],
+        'rationale': template['rationale'],
+        template['settings_key']: {adj['parameter']: adj['current_value'] for adj in proposed},
+        'proposed_adjustments': proposed,
         'expected_effects': {
-            'intents_per_minute': f"예상 증가: {analysis['intents_per_minute']:.2f} → {analysis['intents_per_minute'] * 2.0:.2f}",
-            'risk': '더 많은 신호가 생성되지만, 시장 조건이 좋지 않을 때도 신호 발생',
-            'filter_impact': 'COOLDOWN/TTL 거절 비율 증가 가능',
+            'intents_per_minute': f"예상 증가: {intents_pm:.2f} → {intents_pm * multiplier:.2f}",
+            **template['effects'],
         },
-        'warning': '완화 폭이 크면 노이즈 신호 증가 가능',
+        'warning': template['warning'],
     }
+
+def propose_adjustment_scenarios(
+    params: Dict[str, Any], analysis: Dict[str, Any],
+    h1: Dict[str, Any], h2: Dict[str, Any], h3: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """조정 제안 시나리오 (실제 수정 아님, 제안만)"""
     
-    # === Scenario C: 보수적 접근 - 1단계 완화 ===
-    scenario_c = {
-        'name': 'Scenario C: 1단계 점진적 완화 (Hybrid)',
-        'rationale': '과도한 변화 피하고, ai_score_cut만 조금 완화',
-        'current_settings': {
-            'ai_score_cut': params['signal']['ai_score_cut'],
-        },
-        'proposed_adjustments': [
-            {
-                'parameter': 'ai_score_cut',
-                'current_value': params['signal']['ai_score_cut'],
-                'proposed_value': params['signal']['ai_score_cut'] - 0.03,
-                'rationale': f"기준을 {params['signal']['ai_score_cut']}에서 {params['signal']['ai_score_cut'] - 0.03}로 보수적으로 완화",
-            }
-        ],
-        'expected_effects': {
-            'intents_per_minute': f"예상 증가: {analysis['intents_per_minute']:.2f} → {analysis['intents_per_minute'] * 1.2:.2f}",
-            'risk': '적절한 수준의 신호 증가, 거절 비율은 현재 유지',
-            'benefit': '안정적인 점진적 개선',
-        },
-        'warning': '제한적 개선이지만, 데이터 수집 후 추가 평가 가능',
+    sig = params['signal']
+    currents = {
+        'ai_score_cut': sig['ai_score_cut'],
+        'vol_spike_min': sig.get('vol_spike_min', 2.0),
+        'book_ratio_min': sig.get('book_ratio_min', 1.30),
     }
+    intents_pm = analysis['intents_per_minute']
     
+    scenario_a, scenario_b, scenario_c = (
+        _mk_scenario(template, currents, intents_pm) for template in _SCENARIO_TEMPLATES
+    )
     return scenario_a, scenario_b, scenario_c
 
-def generate_audit_report(params, events):
+def _flush_report(lines: List[str]) -> None:
+    """버퍼에 모은 리포트 줄을 stdout에 한 번에 기록"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def generate_audit_report(params: Dict[str, Any], events: Iterable[Event]) -> None:
     """감사 리포트 생성"""
     
-    print("\n" + "="*80)
-    print("🔍 QUANT-EVO PROMPT QUALITY AUDITOR")
-    print("   (구조적 문제 식별 및 조정 제안)")
-    print("="*80)
+    # 리포트 전체를 모아서 한 번에 출력
+    out: List[str] = []
+    w = out.append
+    
+    w("\n" + "="*80)
+    w("🔍 QUANT-EVO PROMPT QUALITY AUDITOR")
+    w("   (구조적 문제 식별 및 조정 제안)")
+    w("="*80)
     
     analysis = analyze_prompt_structure(params, events)
     
     if not analysis:
-        print("❌ 신호 데이터 부족")
+        w("❌ 신호 데이터 부족")
+        _flush_report(out)
         return
     
-    print(f"\n📊 CURRENT PROMPT STATE")
-    print("-"*80)
-    print(f"버전: {params['version']}")
-    print(f"수집 기간: {analysis['elapsed_minutes']:.1f}분")
-    print(f"신호 생성: {analysis['signal_created_count']}개")
-    print(f"신호율: {analysis['intents_per_minute']:.2f} signals/min (목표: 10-15)")
-    print(f"평균 AI 점수: {analysis['ai_score_mean']:.4f}")
-    print(f"BUY 비율: {analysis['buy_ratio']*100:.0f}%")
-    print(f"실행률: {analysis['sent_rate']:.0f}%")
-    
-    print(f"\n📋 REJECTION BREAKDOWN")
-    print("-"*80)
-    for reason, count in sorted(analysis['rejection_reasons'].items(), key=lambda x: x[1], reverse=True):
-        pct = count / analysis['exec_rejected_count'] * 100 if analysis['exec_rejected_count'] > 0 else 0
-        print(f"  {reason:20s}: {count:3d}개 ({pct:5.1f}%)")
+    w(f"\n📊 CURRENT PROMPT STATE")
+    w("-"*80)
+    w(f"버전: {params['version']}")
+    w(f"수집 기간: {analysis['elapsed_minutes']:.1f}분")
+    w(f"신호 생성: {analysis['signal_created_count']}개")
+    w(f"신호율: {analysis['intents_per_minute']:.2f} signals/min (목표: 10-15)")
+    w(f"평균 AI 점수: {analysis['ai_score_mean']:.4f}")
+    w(f"BUY 비율: {analysis['buy_ratio']*100:.0f}%")
+    w(f"실행률: {analysis['sent_rate']:.0f}%")
+    
+    w(f"\n📋 REJECTION BREAKDOWN")
+    w("-"*80)
+    total_rej = analysis['exec_rejected_count']
+    inv = 100.0 / total_rej if total_rej > 0 else 0.0
+    for reason, count in analysis['rejection_reasons_sorted']:
+        pct = count * inv
+        w(f"  {reason:20s}: {count:3d}개 ({pct:5.1f}%)")
     
     # === DIAGNOSTICS ===
-    print(f"\n🔧 PROBLEM ANALYSIS: 'intents/min이 낮은 이유'")
-    print("-"*80)
+    w(f"\n🔧 PROBLEM ANALYSIS: 'intents/min이 낮은 이유'")
+    w("-"*80)
     
     h1, h2, h3 = diagnose_low_intents_per_minute(params, analysis)
     
-    print(f"\n[원인 가설 1] {h1['name']}")
-    print(f"  영향도: {h1['impact']}")
-    print(f"  현재값: ai_score_cut = {h1['analysis']['ai_score_cut']}")
-    print(f"  실제값: 평균 신호 점수 = {h1['analysis']['actual_mean_score']:.4f}")
-    print(f"  설명: {h1['reasoning']}")
+    w(f"\n[원인 가설 1] {h1['name']}")
+    w(f"  영향도: {h1['impact']}")
+    w(f"  현재값: ai_score_cut = {h1['analysis']['ai_score_cut']}")
+    w(f"  실제값: 평균 신호 점수 = {h1['analysis']['actual_mean_score']:.4f}")
+    w(f"  설명: {h1['reasoning']}")
     
-    print(f"\n[원인 가설 2] {h2['name']}")
-    print(f"  영향도: {h2['impact']}")
-    print(f"  현재값: vol_spike_min = {h2['current_values']['vol_spike_min']}, book_ratio_min = {h2['current_values']['book_ratio_min']}")
-    print(f"  설명: {h2['reasoning']}")
+    w(f"\n[원인 가설 2] {h2['name']}")
+    w(f"  영향도: {h2['impact']}")
+    w(f"  현재값: vol_spike_min = {h2['current_values']['vol_spike_min']}, book_ratio_min = {h2['current_values']['book_ratio_min']}")
+    w(f"  설명: {h2['reasoning']}")
     
-    print(f"\n[원인 가설 3] {h3['name']}")
-    print(f"  영향도: {h3['impact']}")
-    print(f"  조건:")
+    w(f"\n[원인 가설 3] {h3['name']}")
+    w(f"  영향도: {h3['impact']}")
+    w(f"  조건:")
     for key, val in h3['analysis'].items():
-        print(f"    • {key}: {val}")
-    print(f"  설명: {h3['reasoning']}")
+        w(f"    • {key}: {val}")
+    w(f"  설명: {h3['reasoning']}")
     
     # === SCENARIOS ===
-    print(f"\n" + "="*80)
-    print("💡 ADJUSTMENT PROPOSAL SCENARIOS")
-    print("   (실제 수정 금지. 논의/검토용만)")
-    print("="*80)
+    w(f"\n" + "="*80)
+    w("💡 ADJUSTMENT PROPOSAL SCENARIOS")
+    w("   (실제 수정 금지. 논의/검토용만)")
+    w("="*80)
     
     s_a, s_b, s_c = propose_adjustment_scenarios(params, analysis, h1, h2, h3)
     
     for scenario in [s_a, s_b, s_c]:
-        print(f"\n🔹 {scenario['name']}")
-        print(f"   근거: {scenario['rationale']}")
-        print(f"\n   제안 조정:")
+        w(f"\n🔹 {scenario['name']}")
+        w(f"   근거: {scenario['rationale']}")
+        w(f"\n   제안 조정:")
         for adj in scenario['proposed_adjustments']:
-            print(f"     • {adj['parameter']}")
-            print(f"       현재: {adj['current_value']}")
-            print(f"       제안: {adj['proposed_value']}")
-            print(f"       이유: {adj['rationale']}")
+            w(f"     • {adj['parameter']}")
+            w(f"       현재: {adj['current_value']}")
+            w(f"       제안: {adj['proposed_value']}")
+            w(f"       이유: {adj['rationale']}")
         
-        print(f"\n   예상 효과:")
+        w(f"\n   예상 효과:")
         for key, val in scenario['expected_effects'].items():
-            print(f"     • {key}: {val}")
+            w(f"     • {key}: {val}")
         
         if 'warning' in scenario:
-            print(f"\n   ⚠️  주의: {scenario['warning']}")
+            w(f"\n   ⚠️  주의: {scenario['warning']}")
     
     # === RECOMMENDATIONS ===
-    print(f"\n" + "="*80)
-    print("📌 AUDITOR RECOMMENDATIONS")
-    print("="*80)
+    w(f"\n" + "="*80)
+    w("📌 AUDITOR RECOMMENDATIONS")
+    w("="*80)
     
-    print(f"\n1️⃣  우선순위 진단 (가장 제한적인 요소):")
+    w(f"\n1️⃣  우선순위 진단 (가장 제한적인 요소):")
     if h1['impact'] == 'HIGH':
-        print(f"   🔴 [1순위] {h1['name']} - {h1['reasoning'][:80]}...")
+        w(f"   🔴 [1순위] {h1['name']} - {h1['reasoning'][:80]}...")
     if h2['impact'] == 'MEDIUM':
-        print(f"   🟡 [2순위] {h2['name']} - {h2['reasoning'][:80]}...")
+        w(f"   🟡 [2순위] {h2['name']} - {h2['reasoning'][:80]}...")
     if h3['impact'] == 'MEDIUM':
-        print(f"   🟡 [3순위] {h3['name']} - {h3['reasoning'][:80]}...")
-    
-    print(f"\n2️⃣  권장 검토 순서:")
-    print(f"   1단계: 신호율을 저해하는 주 요인 파악")
-    print(f"          → ai_score_cut vs 시장 조건 필터 중 어느 것이 더 제한적인가?")
-    print(f"   2단계: 로그에서 거절된 신호 상세 분석")
-    print(f"          → 거절 신호의 AI 점수는? TTL 만료는 신호 발생 자체 문제인가?")
-    print(f"   3단계: 시나리오별 시뮬레이션 (데이터 수집 후)")
-    print(f"          → 각 파라미터 변화에 따른 intents/min 추정 가능")
-    
-    print(f"\n3️⃣  조정 권장 단계:")
-    print(f"   ✅ Scenario C (1단계 완화)부터 시작")
-    print(f"      이유: 낮은 위험, 데이터 수집 관찰 가능")
-    print(f"   ✅ 100-200개 신호 수집 후 재평가")
-    print(f"   ✅ 필요시 Scenario A/B 고려")
-    
-    print(f"\n4️⃣  금지 사항:")
-    print(f"   ❌ 손익을 기반으로 파라미터 변경")
-    print(f"   ❌ 한 번에 여러 파라미터 동시 변경")
-    print(f"   ❌ 데이터 부족 상태에서 최종 결정")
-    print(f"   ❌ 프롬프트 자동 수정 적용 (반드시 수동 검토)")
-    
-    print(f"\n5️⃣  다음 단계:")
-    print(f"   → 추가 신호 200개 수집")
-    print(f"   → 거절된 신호들의 상세 로그 분석")
-    print(f"   → 시나리오별 예상 효과 재계산")
-    print(f"   → 최종 파라미터 선택 (경영진 협의)")
-    
-    print(f"\n" + "="*80)
-    print(f"📌 NOTE: 이 감사는 로그 통계만 기반입니다.")
-    print(f"   손익, 거래 결과, 실제 수익률은 포함되지 않습니다.")
-    print(f"   파라미터 변경은 신중한 검토 후 수동으로 진행하세요.")
-    print("="*80 + "\n")
+        w(f"   🟡 [3순위] {h3['name']} - {h3['reasoning'][:80]}...")
+    
+    w(f"\n2️⃣  권장 검토 순서:")
+    w(f"   1단계: 신호율을 저해하는 주 요인 파악")
+    w(f"          → ai_score_cut vs 시장 조건 필터 중 어느 것이 더 제한적인가?")
+    w(f"   2단계: 로그에서 거절된 신호 상세 분석")
+    w(f"          → 거절 신호의 AI 점수는? TTL 만료는 신호 발생 자체 문제인가?")
+    w(f"   3단계: 시나리오별 시뮬레이션 (데이터 수집 후)")
+    w(f"          → 각 파라미터 변화에 따른 intents/min 추정 가능")
+    
+    w(f"\n3️⃣  조정 권장 단계:")
+    w(f"   ✅ Scenario C (1단계 완화)부터 시작")
+    w(f"      이유: 낮은 위험, 데이터 수집 관찰 가능")
+    w(f"   ✅ 100-200개 신호 수집 후 재평가")
+    w(f"   ✅ 필요시 Scenario A/B 고려")
+    
+    w(f"\n4️⃣  금지 사항:")
+    w(f"   ❌ 손익을 기반으로 파라미터 변경")
+    w(f"   ❌ 한 번에 여러 파라미터 동시 변경")
+    w(f"   ❌ 데이터 부족 상태에서 최종 결정")
+    w(f"   ❌ 프롬프트 자동 수정 적용 (반드시 수동 검토)")
+    
+    w(f"\n5️⃣  다음 단계:")
+    w(f"   → 추가 신호 200개 수집")
+    w(f"   → 거절된 신호들의 상세 로그 분석")
+    w(f"   → 시나리오별 예상 효과 재계산")
+    w(f"   → 최종 파라미터 선택 (경영진 협의)")
+    
+    w(f"\n" + "="*80)
+    w(f"📌 NOTE: 이 감사는 로그 통계만 기반입니다.")
+    w(f"   손익, 거래 결과, 실제 수익률은 포함되지 않습니다.")
+    w(f"   파라미터 변경은 신중한 검토 후 수동으로 진행하세요.")
+    w("="*80 + "\n")
+    
+    _flush_report(out)
 
-def main():
+def main() -> None:
     project_root = Path(__file__).resolve().parents[1]
     logs_dir = project_root / "shared" / "logs"
     
     # 파라미터 로드
     params = load_params()
     
-    # 로그 로드
+    # 로그 로드 (스트리밍; 첫 이벤트만 미리 꺼내 비어 있는지 확인)
     events = load_jsonl_events(str(logs_dir))
+    first_event = next(events, None)
     
-    if not events:
+    if first_event is None:
         print("❌ 로그 파일을 찾을 수 없습니다.")
         print("   APP64/APP32를 실행하여 신호를 생성한 후 다시 시도하세요.")
         return
     
     # 감사 리포트 생성
-    generate_audit_report(params, events)
+    generate_audit_report(params, chain((first_event,), events))
 
 if __name__ == "__main__":
     main()
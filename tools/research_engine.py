@@ -15,131 +15,451 @@ QUANT-EVO Research Engine: Prompt Quality Evaluation via Log Statistics
 - 다음 단계 조건 체크리스트
 """
 
-import json
+import os
+import pickle
 import sys
+from array import array
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
-from statistics import mean, stdev, median
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import gt, lt
+from types import MappingProxyType
+
+# NumPy (선택) 가 있으면 AI 점수 중앙값을 연속 float64 배열 위에서 C 레벨로 계산
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# orjson은 bytes를 직접 파싱하며 stdlib json보다 수 배 빠름;
+# 설치되지 않은 경우 stdlib json으로 대체 (json도 bytes 입력 허용)
+try:
+    import orjson
+    from orjson import loads as json_loads
+    
+    def _dump_json(obj):
+        """--json 출력용 직렬화 (UTF-8 bytes)"""
+        # 심볼이 없는 이벤트는 None 키로 집계되므로 비문자열 키 허용
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    import json
+    from json import loads as json_loads
+    
+    def _dump_json(obj):
+        """--json 출력용 직렬화 (UTF-8 bytes)"""
+        return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode('utf-8')
+
+# 이보다 버전이 적으면 프로세스 풀 기동/이벤트 전송 비용이 분석 이득보다 큼
+PARALLEL_MIN_VERSIONS = 4
+
+# AI 점수 중앙값을 정확히 계산하는 최대 샘플 수 (초과 시 고정 구간 추정)
+EXACT_SCORE_MAX = 100_000
+
+# 파일별 집계 캐시 형식 버전 (VersionTally 구조가 바뀌면 올려서 기존 캐시 무효화)
+TALLY_CACHE_VERSION = 1
+
+# 이 크기 이하의 파일은 한 번에 읽어 b'\n' 기준으로 분할, 초과 시 줄 단위 스트리밍
+BATCH_READ_MAX_BYTES = 100 * 1024 * 1024
+
+def _list_jsonl_files(logs_dir):
+    """logs_dir 안의 .jsonl 파일 경로(str)를 이름순으로 반환 (디렉터리가 없으면 빈 목록)"""
+    # 이름순 정렬은 유지: 버전별 첫/마지막 SIGNAL_CREATED 시각이 파일 순서에 의존
+    try:
+        with os.scandir(logs_dir) as it:
+            return sorted(entry.path for entry in it
+                          if entry.name.endswith('.jsonl') and entry.is_file())
+    except FileNotFoundError:
+        return []
+
+def _iter_jsonl_lines(path):
+    """JSONL 파일의 원시 줄(bytes) 순회"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= BATCH_READ_MAX_BYTES:
+            # splitlines()는 단독 b'\r'에서도 잘라 스트리밍 경로(b'\n' 기준)와 결과가 달라짐
+            yield from f.read().split(b'\n')
+        else:
+            yield from f
+
+def _iter_file_events(path):
+    """JSONL 파일 하나의 이벤트 스트리밍 (파싱 실패 줄은 건너뜀)"""
+    for line in _iter_jsonl_lines(path):
+        if line and line != b'\n':
+            try:
+                yield json_loads(line)
+            except ValueError:  # JSONDecodeError (stdlib/orjson) 또는 잘못된 UTF-8
+                pass
+
+def iter_events(logs_dir):
+    """JSON Lines 이벤트 스트리밍 (전체 목록을 메모리에 두지 않음)"""
+    for path in _list_jsonl_files(logs_dir):
+        yield from _iter_file_events(path)
 
 def load_jsonl_files(logs_dir):
     """JSON Lines 파일 로드"""
-    logs_path = Path(logs_dir)
-    all_events = []
-    
-    for jsonl_file in sorted(logs_path.glob("*.jsonl")):
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        all_events.append(json.loads(line))
-                    except:
-                        pass
-    
-    return all_events
+    return list(iter_events(logs_dir))
 
 def categorize_events(events):
-    """이벤트를 버전별로 분류"""
-    by_version = defaultdict(list)
+    """이벤트를 버전별, 이벤트 타입별로 한 번에 분류 ({version_id: {event_type: [events]}})"""
+    by_version = defaultdict(lambda: defaultdict(list))
     for event in events:
-        version_id = event.get('params_version_id', 'UNKNOWN')
-        by_version[version_id].append(event)
+        get = event.get
+        by_version[get('params_version_id', 'UNKNOWN')][get('event_type')].append(event)
     return by_version
 
-def analyze_version(events, version_id):
-    """특정 버전의 프롬프트 분석"""
+if sys.version_info >= (3, 11):
+    # 3.11+ fromisoformat은 'Z' 접미사를 직접 처리하므로 문자열 치환 불필요
+    _parse_ts = datetime.fromisoformat
+else:
+    def _parse_ts(ts):
+        """ISO 8601 타임스탬프 파싱 ('Z' 접미사 허용)"""
+        return datetime.fromisoformat(ts[:-1] + '+00:00' if ts.endswith('Z') else ts)
+
+class Welford:
+    """단일 패스 평균/표본 표준편차 (Welford 온라인 알고리즘)"""
+    __slots__ = ('n', 'm', 'm2')
+    
+    def __init__(self):
+        self.n = 0
+        self.m = 0.0
+        self.m2 = 0.0
+    
+    def push(self, x):
+        self.n += 1
+        d = x - self.m
+        self.m += d / self.n
+        self.m2 += d * (x - self.m)
+    
+    def mean(self):
+        return self.m if self.n else 0
+    
+    def std(self):
+        return (self.m2 / (self.n - 1)) ** 0.5 if self.n > 1 else 0
+    
+    def merge(self, other):
+        """다른 누적값 합치기 (Chan 등의 병렬 분산 공식)"""
+        n = self.n + other.n
+        if not other.n:
+            return
+        d = other.m - self.m
+        self.m += d * other.n / n
+        self.m2 += other.m2 + d * d * self.n * other.n / n
+        self.n = n
+
+class SpearBins:
+    """고정 구간 히스토그램 기반 스트리밍 백분위 추정 (샘플당 O(1), 메모리 고정)"""
+    __slots__ = ('lo', 'hi', 'nbins', 'counts', 'n')
+    
+    def __init__(self, nbins=128, lo=0.0, hi=1.0):
+        self.lo = lo
+        self.hi = hi
+        self.nbins = nbins
+        self.counts = [0] * nbins
+        self.n = 0
+    
+    def push(self, x):
+        i = int((x - self.lo) / (self.hi - self.lo) * self.nbins)
+        self.counts[min(max(i, 0), self.nbins - 1)] += 1
+        self.n += 1
+    
+    def percentile(self, q):
+        """누적 빈도 위에서 구간 내 선형 보간"""
+        target = self.n * q / 100.0
+        width = (self.hi - self.lo) / self.nbins
+        cum = 0
+        for i, count in enumerate(self.counts):
+            if count and cum + count >= target:
+                return self.lo + (i + (target - cum) / count) * width
+            cum += count
+        return self.hi
+    
+    def merge(self, other):
+        """같은 구간 설정의 히스토그램 합치기"""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.n += other.n
+
+class ScoreAccumulator(Welford):
+    """
+    AI 점수 누적: 평균/표준편차는 Welford, 중앙값은 EXACT_SCORE_MAX개까지
+    정확히 계산하고 그 이상은 SpearBins 추정으로 전환 (샘플 버퍼 해제)
+    """
+    __slots__ = ('samples', 'bins')
+    
+    def __init__(self):
+        Welford.__init__(self)
+        self.samples = array('d')  # PyFloat 객체 대신 연속 8바이트 double 버퍼
+        self.bins = None
+    
+    def push(self, x):
+        Welford.push(self, x)
+        samples = self.samples
+        if samples is None:
+            self.bins.push(x)
+            return
+        samples.append(x)
+        if len(samples) > EXACT_SCORE_MAX:
+            self._switch_to_bins()
+    
+    def _switch_to_bins(self):
+        self.bins = SpearBins()
+        for v in self.samples:
+            self.bins.push(v)
+        self.samples = None
+    
+    def merge(self, other):
+        Welford.merge(self, other)
+        if self.samples is not None and other.samples is not None:
+            self.samples.extend(other.samples)
+            if len(self.samples) > EXACT_SCORE_MAX:
+                self._switch_to_bins()
+            return
+        if self.samples is not None:
+            self._switch_to_bins()
+        if other.samples is not None:
+            for v in other.samples:
+                self.bins.push(v)
+        else:
+            self.bins.merge(other.bins)
+    
+    def median(self):
+        if not self.n:
+            return 0
+        if self.samples is None:
+            return self.bins.percentile(50)
+        if np is not None:
+            return float(np.median(np.frombuffer(self.samples, dtype=np.float64)))  # 복사 없이 버퍼 공유
+        ordered = sorted(self.samples)
+        mid = len(ordered) // 2
+        return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+    
+    def stats(self):
+        return {'mean': self.mean(), 'std': self.std(), 'median': self.median()}
+
+class VersionTally:
+    """
+    버전 하나의 집계 상태. 파일 단위로 만든 뒤 파일 순서대로 merge하면
+    전체 이벤트를 한 번에 집계한 것과 같은 결과 (증분 캐시용)
+    """
+    __slots__ = ('created', 'sent', 'rejected', 'buy_signals', 'rejection_reasons',
+                 'symbol_sent', 'symbol_rejected', 'start_ts', 'end_ts')
+    
+    def __init__(self):
+        self.created = ScoreAccumulator()
+        self.sent = ScoreAccumulator()
+        self.rejected = ScoreAccumulator()
+        self.buy_signals = 0
+        self.rejection_reasons = Counter()
+        self.symbol_sent = Counter()
+        self.symbol_rejected = Counter()
+        self.start_ts = None
+        self.end_ts = None
+    
+    def add(self, grouped):
+        """categorize_events의 {event_type: [events]} 집계"""
+        signal_created_events = grouped.get('SIGNAL_CREATED', ())
+        exec_sent_events = grouped.get('EXEC_SENT', ())
+        exec_rejected_events = grouped.get('EXEC_REJECTED', ())
+        
+        # 첫/마지막 SIGNAL_CREATED 시각 (경과 시간 계산용)
+        if signal_created_events:
+            if not self.created.n:
+                self.start_ts = signal_created_events[0].get('ts')
+            self.end_ts = signal_created_events[-1].get('ts')
+        
+        # 메서드 조회를 루프 밖으로 끌어올려 이벤트당 바이트코드 수를 줄임
+        push_created = self.created.push
+        push_sent = self.sent.push
+        push_rejected = self.rejected.push
+        buy_signals = 0
+        
+        # 이미 타입별로 나뉘어 있으므로 각 목록을 한 번씩만 순회
+        for e in signal_created_events:
+            get = e.get
+            push_created(get('ai_score', 0))
+            if get('action') == 'BUY':
+                buy_signals += 1
+        
+        for e in exec_sent_events:
+            push_sent(e.get('ai_score', 0))
+        
+        for e in exec_rejected_events:
+            push_rejected(e.get('ai_score', 0))
+        
+        self.buy_signals += buy_signals
+        
+        # 빈도 집계는 Counter의 C 구현(_count_elements)으로
+        self.rejection_reasons.update(e.get('rejection_reason', 'UNKNOWN') for e in exec_rejected_events)
+        self.symbol_sent.update(e.get('symbol') for e in exec_sent_events)
+        self.symbol_rejected.update(e.get('symbol') for e in exec_rejected_events)
+    
+    def merge(self, other):
+        """뒤에 오는 파일의 집계 합치기"""
+        if other.created.n:
+            if not self.created.n:
+                self.start_ts = other.start_ts
+            self.end_ts = other.end_ts
+        self.created.merge(other.created)
+        self.sent.merge(other.sent)
+        self.rejected.merge(other.rejected)
+        self.buy_signals += other.buy_signals
+        self.rejection_reasons.update(other.rejection_reasons)
+        self.symbol_sent.update(other.symbol_sent)
+        self.symbol_rejected.update(other.symbol_rejected)
+
+def analyze_version(grouped, version_id):
+    """특정 버전의 프롬프트 분석 (grouped: categorize_events의 이벤트 타입별 목록)"""
+    tally = VersionTally()
+    tally.add(grouped)
+    return summarize_version(tally, version_id)
+
+def summarize_version(tally, version_id):
+    """VersionTally로부터 버전 분석 결과 계산"""
     
-    signal_created = [e for e in events if e.get('event_type') == 'SIGNAL_CREATED']
-    exec_sent = [e for e in events if e.get('event_type') == 'EXEC_SENT']
-    exec_rejected = [e for e in events if e.get('event_type') == 'EXEC_REJECTED']
+    signal_created = tally.created.n
+    exec_sent = tally.sent.n
+    exec_rejected = tally.rejected.n
     
     # === 1. 신호 생성 패턴 분석 ===
     if signal_created:
-        start_ts = signal_created[0].get('ts')
-        end_ts = signal_created[-1].get('ts')
-        
         try:
-            start = datetime.fromisoformat(start_ts.replace('Z', '+00:00'))
-            end = datetime.fromisoformat(end_ts.replace('Z', '+00:00'))
-            elapsed_seconds = (end - start).total_seconds()
+            elapsed_seconds = (_parse_ts(tally.end_ts) - _parse_ts(tally.start_ts)).total_seconds()
             elapsed_minutes = elapsed_seconds / 60.0 if elapsed_seconds > 0 else 1.0
-        except:
+        except (AttributeError, TypeError, ValueError):  # ts 누락 또는 형식 오류
             elapsed_minutes = 1.0
     else:
         elapsed_minutes = 1.0
     
-    intents_per_minute = len(signal_created) / elapsed_minutes if elapsed_minutes > 0 else 0
+    intents_per_minute = signal_created / elapsed_minutes if elapsed_minutes > 0 else 0
     
     # === 2. BUY 비율 분석 ===
-    buy_signals = sum(1 for e in signal_created if e.get('action') == 'BUY')
-    buy_ratio = buy_signals / len(signal_created) if signal_created else 0
+    buy_ratio = tally.buy_signals / signal_created if signal_created else 0
     
     # === 3. AI 점수 분포 ===
-    ai_scores_created = [e.get('ai_score', 0) for e in signal_created]
-    ai_scores_sent = [e.get('ai_score', 0) for e in exec_sent]
-    ai_scores_rejected = [e.get('ai_score', 0) for e in exec_rejected]
+    created_stats = tally.created.stats()
+    sent_stats = tally.sent.stats()
+    rejected_stats = tally.rejected.stats()
     
     # === 4. 실행률 ===
-    sent_rate = len(exec_sent) / len(signal_created) * 100 if signal_created else 0
-    rejected_rate = len(exec_rejected) / len(signal_created) * 100 if signal_created else 0
-    
-    # === 5. 거절 이유 분석 ===
-    rejection_reasons = defaultdict(int)
-    for e in exec_rejected:
-        reason = e.get('rejection_reason', 'UNKNOWN')
-        rejection_reasons[reason] += 1
-    
-    # === 6. 심볼별 분석 ===
-    symbol_sent = defaultdict(int)
-    symbol_rejected = defaultdict(int)
-    for e in exec_sent:
-        symbol_sent[e.get('symbol')] += 1
-    for e in exec_rejected:
-        symbol_rejected[e.get('symbol')] += 1
+    sent_rate = exec_sent / signal_created * 100 if signal_created else 0
+    rejected_rate = exec_rejected / signal_created * 100 if signal_created else 0
     
     # === 7. 단타 승률 가능성 분석 ===
     # 정의: AI 점수 높고 거절 적으면 승률 가능성 높음
     quality_score = (
-        (1.0 if ai_scores_sent and mean(ai_scores_sent) > 0.70 else 0.5) * 0.3 +
+        (1.0 if exec_sent and sent_stats['mean'] > 0.70 else 0.5) * 0.3 +
         (1.0 if sent_rate > 80 else (sent_rate / 80) if sent_rate > 0 else 0) * 0.4 +
         (1.0 if buy_ratio >= 0.6 and buy_ratio <= 0.8 else 0.5) * 0.3
     )
     
     return {
         'version_id': version_id,
-        'signal_created': len(signal_created),
-        'exec_sent': len(exec_sent),
-        'exec_rejected': len(exec_rejected),
+        'signal_created': signal_created,
+        'exec_sent': exec_sent,
+        'exec_rejected': exec_rejected,
         'elapsed_minutes': elapsed_minutes,
         'intents_per_minute': intents_per_minute,
         'buy_ratio': buy_ratio,
         'sent_rate': sent_rate,
         'rejected_rate': rejected_rate,
-        'rejection_reasons': dict(rejection_reasons),
+        'rejection_reasons': Counter(tally.rejection_reasons),
         'ai_score_stats': {
-            'created': {
-                'mean': mean(ai_scores_created) if ai_scores_created else 0,
-                'std': stdev(ai_scores_created) if len(ai_scores_created) > 1 else 0,
-                'median': median(ai_scores_created) if ai_scores_created else 0,
-            },
-            'sent': {
-                'mean': mean(ai_scores_sent) if ai_scores_sent else 0,
-                'std': stdev(ai_scores_sent) if len(ai_scores_sent) > 1 else 0,
-                'median': median(ai_scores_sent) if ai_scores_sent else 0,
-            },
-            'rejected': {
-                'mean': mean(ai_scores_rejected) if ai_scores_rejected else 0,
-                'std': stdev(ai_scores_rejected) if len(ai_scores_rejected) > 1 else 0,
-                'median': median(ai_scores_rejected) if ai_scores_rejected else 0,
-            }
+            'created': created_stats,
+            'sent': sent_stats,
+            'rejected': rejected_stats,
         },
         'symbol_performance': {
-            'sent': dict(symbol_sent),
-            'rejected': dict(symbol_rejected),
+            'sent': dict(tally.symbol_sent),
+            'rejected': dict(tally.symbol_rejected),
         },
         'quality_score': quality_score,  # 0.0 ~ 1.0
     }
 
+def _tally_file(path):
+    """파일 하나의 (이벤트 수, {version_id: VersionTally})"""
+    by_version = categorize_events(_iter_file_events(path))
+    event_count = 0
+    tallies = {}
+    for version_id, grouped in by_version.items():
+        event_count += sum(len(typed) for typed in grouped.values())
+        tallies[version_id] = tally = VersionTally()
+        tally.add(grouped)
+    return event_count, tallies
+
+def _read_tally_cache(cache_file):
+    """{(파일명, mtime_ns, 크기): (이벤트 수, tallies)} - 없거나 읽을 수 없으면 빈 dict"""
+    try:
+        with open(cache_file, 'rb') as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as e:
+        print(f"⚠️  읽을 수 없는 집계 캐시 무시: {cache_file.name} ({e})", file=sys.stderr)
+        return {}
+    if not isinstance(data, dict) or data.get('version') != TALLY_CACHE_VERSION:
+        return {}
+    return data['entries']
+
+def _write_tally_cache(cache_file, entries):
+    """현재 로그 파일들의 집계만 저장 (삭제된 파일 항목은 버림)"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+    with open(tmp_file, 'wb') as f:
+        pickle.dump({'version': TALLY_CACHE_VERSION, 'entries': entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
+def load_version_tallies(logs_dir, cache_file):
+    """
+    파일별 집계를 파일 순서대로 병합한 ({version_id: VersionTally}, 이벤트 수).
+    (파일명, mtime_ns, 크기)가 그대로인 파일은 cache_file의 집계를 재사용하고
+    새로 생기거나 바뀐 파일만 파싱
+    """
+    cached = _read_tally_cache(cache_file)
+    entries = {}
+    merged = {}
+    event_count = 0
+    
+    for path in _list_jsonl_files(logs_dir):
+        st = os.stat(path)
+        key = (os.path.basename(path), st.st_mtime_ns, st.st_size)
+        entry = cached.get(key)
+        if entry is None:
+            entry = _tally_file(path)
+        entries[key] = entry
+        
+        count, tallies = entry
+        event_count += count
+        for version_id, tally in tallies.items():
+            # 캐시 항목을 변경하지 않도록 항상 새 VersionTally에 병합
+            if version_id not in merged:
+                merged[version_id] = VersionTally()
+            merged[version_id].merge(tally)
+    
+    if entries.keys() != cached.keys():
+        try:
+            _write_tally_cache(cache_file, entries)
+        except OSError as e:
+            print(f"⚠️  집계 캐시 저장 실패: {e}", file=sys.stderr)
+    
+    return merged, event_count
+
+def _analyze_pair(task):
+    """(version_id, grouped) 튜플 분석 - 프로세스 풀 작업 단위"""
+    version_id, grouped = task
+    return analyze_version(grouped, version_id)
+
+def analyze_versions(by_version, version_ids):
+    """버전별 분석 (버전이 많으면 프로세스 병렬, 결과는 version_ids 순서 유지)"""
+    tasks = [(version_id, by_version[version_id]) for version_id in version_ids]
+    workers = min(os.cpu_count() or 1, len(tasks))
+    
+    if len(tasks) < PARALLEL_MIN_VERSIONS or workers < 2:
+        return [_analyze_pair(task) for task in tasks]
+    
+    # 버전끼리는 독립적이므로 GIL을 피해 프로세스에 분산
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_analyze_pair, tasks))
+
 def evaluate_prompt_state(analysis):
     """프롬프트 상태 평가"""
     
@@ -205,72 +525,103 @@ def evaluate_prompt_state(analysis):
         'buy_bias': buy_bias,
     }
 
+def _risk(level, signal, reason, impact):
+    return MappingProxyType({'level': level, 'signal': signal, 'reason': reason, 'impact': impact})
+
+# 고정 임계값 위험 규칙: 그룹 안에서는 첫 번째로 일치한 규칙만 적용 (if/elif)
+# (지표, 비교, 임계값, 대상 목록, 템플릿)
+_RISK_RULES_HEAD = (
+    # === Risk 1: 실행률이 너무 높음 (필터 무시) ===
+    (
+        ('sent_rate', gt, 95, 'risks', _risk(
+            'HIGH', '실행률 과도히 높음 (>95%)',
+            '거의 모든 신호가 실행됨 = 필터가 작동 안 함', '위험한 신호도 실행될 가능성')),
+        ('sent_rate', gt, 85, 'warnings', _risk(
+            'MEDIUM', '실행률이 높음 (>85%)',
+            '필터링이 충분하지 않을 수 있음', '거절 이유 분석 필요')),
+    ),
+    # === Risk 2: 실행률이 너무 낮음 (과도한 필터) ===
+    (
+        ('sent_rate', lt, 20, 'warnings', _risk(
+            'MEDIUM', '실행률 과도히 낮음 (<20%)',
+            '필터가 너무 엄격하거나 신호 품질 문제', '거래 기회 상실')),
+    ),
+    # === Risk 3: BUY 비율 극단적 ===
+    (
+        ('buy_ratio', gt, 0.85, 'warnings', _risk(
+            'MEDIUM', 'BUY 비율 과도히 높음 (>85%)',
+            '프롬프트가 매수만 권장 = 단방향 베팅', '하락장 손실 위험, 다양성 부족')),
+        ('buy_ratio', lt, 0.3, 'warnings', _risk(
+            'MEDIUM', 'BUY 비율 과도히 낮음 (<30%)',
+            '프롬프트가 매도/관망만 권장', '상승장 수익 기회 상실')),
+    ),
+)
+
+_RISK_RULES_TAIL = (
+    # === Risk 6: AI 점수 너무 낮음 ===
+    (
+        ('ai_sent', lt, 0.6, 'warnings', _risk(
+            'MEDIUM', '실행 신호의 AI 점수 낮음 (<0.60)',
+            '신뢰도 낮은 신호가 실행 중', '잘못된 거래 가능성 증가')),
+    ),
+    # === Risk 7: 신호 생성 부족 ===
+    (
+        ('intents_per_minute', lt, 2, 'warnings', _risk(
+            'MEDIUM', '신호 생성율 매우 낮음 (<2/min)',
+            '분당 2개 미만의 신호 = 프롬프트가 너무 보수적', '거래 기회 심각하게 부족')),
+    ),
+    # === Risk 8: 과최적화 가능성 (정보 부족) ===
+    (
+        ('signal_created', lt, 50, 'warnings', _risk(
+            'INFO', '수집된 데이터 부족 (<50개 신호)',
+            '통계적 유의성 확보 필요', '현재 지표의 신뢰도 낮음, 추가 데이터 수집 필요')),
+    ),
+)
+
+def _apply_risk_rules(rules, values, out):
+    """규칙 그룹별로 첫 번째 일치 규칙의 템플릿을 해당 목록에 추가"""
+    for group in rules:
+        for metric, op, threshold, target, template in group:
+            if op(values[metric], threshold):
+                out[target].append(dict(template))
+                break
+
 def identify_risk_signals(analysis):
     """위험 신호 식별"""
     
     risks = []
     warnings = []
+    out = {'risks': risks, 'warnings': warnings}
     
-    # === Risk 1: 실행률이 너무 높음 (필터 무시) ===
-    if analysis['sent_rate'] > 95:
-        risks.append({
-            'level': 'HIGH',
-            'signal': '실행률 과도히 높음 (>95%)',
-            'reason': '거의 모든 신호가 실행됨 = 필터가 작동 안 함',
-            'impact': '위험한 신호도 실행될 가능성',
-        })
-    elif analysis['sent_rate'] > 85:
-        warnings.append({
-            'level': 'MEDIUM',
-            'signal': '실행률이 높음 (>85%)',
-            'reason': '필터링이 충분하지 않을 수 있음',
-            'impact': '거절 이유 분석 필요',
-        })
-    
-    # === Risk 2: 실행률이 너무 낮음 (과도한 필터) ===
-    if analysis['sent_rate'] < 20:
-        warnings.append({
-            'level': 'MEDIUM',
-            'signal': '실행률 과도히 낮음 (<20%)',
-            'reason': '필터가 너무 엄격하거나 신호 품질 문제',
-            'impact': '거래 기회 상실',
-        })
+    ai_sent = analysis['ai_score_stats']['sent']['mean']
+    ai_rejected = analysis['ai_score_stats']['rejected']['mean']
+    values = {
+        'sent_rate': analysis['sent_rate'],
+        'buy_ratio': analysis['buy_ratio'],
+        'ai_sent': ai_sent,
+        'intents_per_minute': analysis['intents_per_minute'],
+        'signal_created': analysis['signal_created'],
+    }
     
-    # === Risk 3: BUY 비율 극단적 ===
-    if analysis['buy_ratio'] > 0.85:
-        warnings.append({
-            'level': 'MEDIUM',
-            'signal': 'BUY 비율 과도히 높음 (>85%)',
-            'reason': '프롬프트가 매수만 권장 = 단방향 베팅',
-            'impact': '하락장 손실 위험, 다양성 부족',
-        })
-    elif analysis['buy_ratio'] < 0.3:
-        warnings.append({
-            'level': 'MEDIUM',
-            'signal': 'BUY 비율 과도히 낮음 (<30%)',
-            'reason': '프롬프트가 매도/관망만 권장',
-            'impact': '상승장 수익 기회 상실',
-        })
+    # === Risk 1~3: 실행률 / BUY 비율 ===
+    _apply_risk_rules(_RISK_RULES_HEAD, values, out)
     
     # === Risk 4: 거절 이유 분포 불균형 ===
     rejection_reasons = analysis['rejection_reasons']
     if rejection_reasons:
         total_rejections = sum(rejection_reasons.values())
-        top_reason = max(rejection_reasons.items(), key=lambda x: x[1])
-        top_ratio = top_reason[1] / total_rejections if total_rejections > 0 else 0
+        top_reason, top_count = rejection_reasons.most_common(1)[0]
+        top_ratio = top_count / total_rejections if total_rejections > 0 else 0
         
         if top_ratio > 0.7:
             warnings.append({
                 'level': 'MEDIUM',
-                'signal': f'거절 이유 편중: {top_reason[0]} ({top_ratio*100:.0f}%)',
+                'signal': f'거절 이유 편중: {top_reason} ({top_ratio*100:.0f}%)',
                 'reason': '한 가지 이유로만 거절됨 = 필터 불균형',
                 'impact': '다른 위험 신호를 놓칠 가능성',
             })
     
     # === Risk 5: AI 점수 역전 (SENT < REJECTED) ===
-    ai_sent = analysis['ai_score_stats']['sent']['mean']
-    ai_rejected = analysis['ai_score_stats']['rejected']['mean']
-    
     if ai_sent > 0 and ai_rejected > 0 and ai_sent < ai_rejected:
         warnings.append({
             'level': 'HIGH',
@@ -279,32 +630,8 @@ def identify_risk_signals(analysis):
             'impact': '필터가 좋은 신호를 거절하고 나쁜 신호만 실행 중',
         })
     
-    # === Risk 6: AI 점수 너무 낮음 ===
-    if ai_sent < 0.6:
-        warnings.append({
-            'level': 'MEDIUM',
-            'signal': '실행 신호의 AI 점수 낮음 (<0.60)',
-            'reason': '신뢰도 낮은 신호가 실행 중',
-            'impact': '잘못된 거래 가능성 증가',
-        })
-    
-    # === Risk 7: 신호 생성 부족 ===
-    if analysis['intents_per_minute'] < 2:
-        warnings.append({
-            'level': 'MEDIUM',
-            'signal': '신호 생성율 매우 낮음 (<2/min)',
-            'reason': '분당 2개 미만의 신호 = 프롬프트가 너무 보수적',
-            'impact': '거래 기회 심각하게 부족',
-        })
-    
-    # === Risk 8: 과최적화 가능성 (정보 부족) ===
-    if analysis['signal_created'] < 50:
-        warnings.append({
-            'level': 'INFO',
-            'signal': '수집된 데이터 부족 (<50개 신호)',
-            'reason': '통계적 유의성 확보 필요',
-            'impact': '현재 지표의 신뢰도 낮음, 추가 데이터 수집 필요',
-        })
+    # === Risk 6~8: AI 점수 / 신호 생성율 / 데이터 양 ===
+    _apply_risk_rules(_RISK_RULES_TAIL, values, out)
     
     return risks, warnings
 
@@ -410,7 +737,7 @@ def define_win_rate_potential(analysis):
         'components': score_components,
     }
 
-def generate_checklist(analysis, win_rate, risks, warnings):
+def generate_checklist(analysis, win_rate, risks, warnings, state):
     """다음 단계 조건 체크리스트"""
     
     checklist = []
@@ -482,7 +809,7 @@ def generate_checklist(analysis, win_rate, risks, warnings):
         checklist.append({
             'stage': '4. 신호 품질',
             'status': '⚠️  REVIEW',
-            'condition': f"실행률 {analysis['sent_rate']:.0f}% ({'과도' if analysis['sent_rate'] > 90 else '부족'})",
+            'condition': f"실행률 {analysis['sent_rate']:.0f}% ({'과도' if state['quality_level'] == 'LOOSE' else '부족'})",
             'target': '실행률 50-90% 범위로 조정',
             'action': '필터 파라미터 재검토',
         })
@@ -515,183 +842,261 @@ def generate_checklist(analysis, win_rate, risks, warnings):
     
     return checklist
 
+_EQ = "=" * 80
+_DASH = "-" * 80
+
+# 리포트 고정 문구 템플릿 - 서식 문자열 파싱은 import 시 한 번, 버전마다 format_map만 수행
+_REPORT_TEMPLATE = (
+    "\n" + _EQ + "\n"
+    "🔬 QUANT-EVO RESEARCH ENGINE: PROMPT QUALITY EVALUATION\n"
+    + _EQ + "\n"
+    "\n📊 ANALYZED VERSION: {a[version_id]}\n"
+    "   Time Window: {a[elapsed_minutes]:.1f} minutes\n"
+    "   Sample Size: {a[signal_created]} signals\n"
+    # === 현재 프롬프트 상태 평가 ===
+    "\n" + _DASH + "\n"
+    "📋 CURRENT PROMPT STATE EVALUATION\n"
+    + _DASH + "\n"
+    "\n1️⃣  공격성 (Aggressiveness):\n"
+    "   수준: {state[aggressiveness]} ({state[aggressiveness_level]})\n"
+    "   신호율: {a[intents_per_minute]:.2f} signals/min\n"
+    "   평가: {aggressiveness_verdict}\n"
+    "\n2️⃣  필터 품질 (Filter Quality):\n"
+    "   실행률: {a[sent_rate]:.0f}%\n"
+    "   거절률: {a[rejected_rate]:.0f}%\n"
+    "   평가: {state[quality]}\n"
+    "\n3️⃣  매수/매도 분포 (Buy/Sell Distribution):\n"
+    "   BUY 비율: {buy_pct:.0f}%\n"
+    "   평가: {state[buy_evaluation]}\n"
+    "\n4️⃣  신호 신뢰도 (AI Score Statistics):\n"
+    "   생성 신호: μ={ai[created][mean]:.4f}, σ={ai[created][std]:.4f}\n"
+    "   실행 신호: μ={ai[sent][mean]:.4f}, σ={ai[sent][std]:.4f}\n"
+    "   거절 신호: μ={ai[rejected][mean]:.4f}, σ={ai[rejected][std]:.4f}\n"
+    "{filter_verdict}\n"
+    "\n5️⃣  거절 이유 분석 (Rejection Breakdown):\n"
+    "{rejection_lines}"
+    # === 위험 신호 ===
+    "\n" + _DASH + "\n"
+    "⚠️  RISK SIGNALS & WARNINGS\n"
+    + _DASH + "\n"
+    "{risk_block}"
+    "{warning_block}"
+    # === 단타 승률 가능성 ===
+    "\n" + _DASH + "\n"
+    "📈 DAY TRADING WIN RATE POTENTIAL\n"
+    + _DASH + "\n"
+    "\n전체 점수: {win[potential_win_rate]:.1%} ({win[category]})\n"
+    "평가: {win[description]}\n"
+    "\n구성 요소:\n"
+    "{component_lines}"
+    # === 다음 단계 체크리스트 ===
+    "\n" + _DASH + "\n"
+    "✅ NEXT STEPS CHECKLIST\n"
+    + _DASH + "\n"
+    "{checklist_block}"
+    # === 최종 권장사항 ===
+    "\n" + _EQ + "\n"
+    "🎯 FINAL RECOMMENDATION\n"
+    + _EQ + "\n"
+    "{recommendation}"
+    "\n" + _EQ + "\n"
+    "📌 NOTE: 이 평가는 로그 통계만을 기반으로 합니다.\n"
+    "   손익이나 실제 거래 결과는 포함되지 않습니다.\n"
+    + _EQ + "\n\n"
+)
+
+_REJECTION_LINE_TEMPLATE = "   • {0}: {1}개 ({2:.0f}%)\n"
+_RISK_ITEM_TEMPLATE = "\n   {0}. {1[signal]}\n      원인: {1[reason]}\n      영향: {1[impact]}\n"
+_COMPONENT_LINE_TEMPLATE = "  • {0:20s}: {1} {2:.1%} - {3}\n"
+
+# 체크리스트 항목의 선택 필드 (출력 순서, 라벨)
+_CHECKLIST_FIELDS = (
+    ('condition', '조건'),
+    ('target', '목표'),
+    ('action', '조치'),
+    ('rationale', '근거'),
+    ('estimated_time', '예상시간'),
+)
+
+# 승률 가능성 하한별 최종 권장사항 (위에서부터 첫 번째로 충족하는 항목)
+_RECOMMENDATIONS = (
+    (0.85,
+     "\n✅ READY FOR LIVE TESTING\n"
+     "\n이 프롬프트는 실전 거래 테스트를 시작할 준비가 되었습니다.\n"
+     "• 작은 규모부터 시작하세요\n"
+     "• 실행된 거래의 결과를 추적하세요\n"
+     "• 수익/손실보다는 기계적 거래 실행에 집중하세요\n"),
+    (0.70,
+     "\n⚠️  GOOD BUT NEEDS MONITORING\n"
+     "\n이 프롬프트는 유망하지만 추가 검증이 필요합니다.\n"
+     "• 추가 100-200개 신호를 수집하세요\n"
+     "• 안정성을 모니터링하세요\n"
+     "• 경고 항목들을 지켜보세요\n"),
+    (0.55,
+     "\n🔄 NEEDS REFINEMENT\n"
+     "\n이 프롬프트는 개선이 필요합니다.\n"
+     "• 주요 위험 신호들을 해결하세요\n"
+     "• 필터 파라미터를 재검토하세요\n"
+     "• 프롬프트 미세 조정을 고려하세요\n"),
+    (float('-inf'),
+     "\n❌ MAJOR REVISION REQUIRED\n"
+     "\n이 프롬프트는 전반적인 재검토가 필요합니다.\n"
+     "• 현재 설정으로는 위험합니다\n"
+     "• 프롬프트의 핵심 로직을 다시 검토하세요\n"
+     "• 필터 파라미터를 완전히 재설정하세요\n"),
+)
+
+def _render_items(header, items):
+    """위험/경고 목록 블록 (헤더 + 번호 매긴 항목)"""
+    return header + "".join(_RISK_ITEM_TEMPLATE.format(i, item) for i, item in enumerate(items, 1))
+
+def evaluate_version(analysis):
+    """버전 분석 결과에 대한 평가 묶음 (상태, 위험/경고, 승률 가능성, 체크리스트)"""
+    # 평가 함수는 한 번씩만 실행하고 결과를 리포트 섹션과 체크리스트에 재사용
+    state = evaluate_prompt_state(analysis)
+    risks, warnings = identify_risk_signals(analysis)
+    win_rate = define_win_rate_potential(analysis)
+    return {
+        'state': state,
+        'risks': risks,
+        'warnings': warnings,
+        'win_rate': win_rate,
+        'checklist': generate_checklist(analysis, win_rate, risks, warnings, state),
+    }
+
 def print_research_report(version_analysis, all_versions=None):
     """최종 리서치 리포트 출력"""
     
     analysis = version_analysis
+    ai = analysis['ai_score_stats']
     
-    print("\n" + "="*80)
-    print("🔬 QUANT-EVO RESEARCH ENGINE: PROMPT QUALITY EVALUATION")
-    print("="*80)
-    
-    print(f"\n📊 ANALYZED VERSION: {analysis['version_id']}")
-    print(f"   Time Window: {analysis['elapsed_minutes']:.1f} minutes")
-    print(f"   Sample Size: {analysis['signal_created']} signals")
-    
-    # === 현재 프롬프트 상태 평가 ===
-    print("\n" + "-"*80)
-    print("📋 CURRENT PROMPT STATE EVALUATION")
-    print("-"*80)
-    
-    state = evaluate_prompt_state(analysis)
-    
-    print(f"\n1️⃣  공격성 (Aggressiveness):")
-    print(f"   수준: {state['aggressiveness']} ({state['aggressiveness_level']})")
-    print(f"   신호율: {analysis['intents_per_minute']:.2f} signals/min")
-    print(f"   평가: {'✅ 적절' if state['aggressiveness_level'] in ['MEDIUM', 'MEDIUM-HIGH'] else '⚠️ 검토 필요'}")
-    
-    print(f"\n2️⃣  필터 품질 (Filter Quality):")
-    print(f"   실행률: {analysis['sent_rate']:.0f}%")
-    print(f"   거절률: {analysis['rejected_rate']:.0f}%")
-    print(f"   평가: {state['quality']}")
-    
-    print(f"\n3️⃣  매수/매도 분포 (Buy/Sell Distribution):")
-    print(f"   BUY 비율: {analysis['buy_ratio']*100:.0f}%")
-    print(f"   평가: {state['buy_evaluation']}")
+    evaluation = evaluate_version(analysis)
+    state = evaluation['state']
+    risks = evaluation['risks']
+    warnings = evaluation['warnings']
+    win_rate = evaluation['win_rate']
+    checklist = evaluation['checklist']
     
-    print(f"\n4️⃣  신호 신뢰도 (AI Score Statistics):")
-    print(f"   생성 신호: μ={analysis['ai_score_stats']['created']['mean']:.4f}, σ={analysis['ai_score_stats']['created']['std']:.4f}")
-    print(f"   실행 신호: μ={analysis['ai_score_stats']['sent']['mean']:.4f}, σ={analysis['ai_score_stats']['sent']['std']:.4f}")
-    print(f"   거절 신호: μ={analysis['ai_score_stats']['rejected']['mean']:.4f}, σ={analysis['ai_score_stats']['rejected']['std']:.4f}")
-    
-    # AI 점수 비교
-    if analysis['ai_score_stats']['sent']['mean'] > analysis['ai_score_stats']['rejected']['mean']:
-        print(f"   ✅ 필터 효율: 높은 신호만 선택 중 (좋음)")
-    else:
-        print(f"   ⚠️  필터 효율: REVERSED! 낮은 신호가 실행 중 (위험)")
-    
-    print(f"\n5️⃣  거절 이유 분석 (Rejection Breakdown):")
-    if analysis['rejection_reasons']:
-        for reason, count in sorted(analysis['rejection_reasons'].items(), 
-                                   key=lambda x: x[1], reverse=True):
-            pct = count / sum(analysis['rejection_reasons'].values()) * 100
-            print(f"   • {reason}: {count}개 ({pct:.0f}%)")
+    # === 가변 블록 ===
+    rejection_reasons = analysis['rejection_reasons']
+    if rejection_reasons:
+        # 합계는 루프 밖에서 한 번만 계산 (0건 항목만 있는 경우 0으로 나누지 않도록 1로 대체)
+        total_rej = sum(rejection_reasons.values()) or 1
+        rejection_lines = "".join(
+            _REJECTION_LINE_TEMPLATE.format(reason, count, count / total_rej * 100)
+            for reason, count in rejection_reasons.most_common()
+        )
     else:
-        print(f"   • 거절 없음")
-    
-    # === 위험 신호 ===
-    risks, warnings = identify_risk_signals(analysis)
-    
-    print("\n" + "-"*80)
-    print("⚠️  RISK SIGNALS & WARNINGS")
-    print("-"*80)
+        rejection_lines = "   • 거절 없음\n"
     
     if risks:
-        print(f"\n🚨 HIGH PRIORITY RISKS ({len(risks)}개):")
-        for i, risk in enumerate(risks, 1):
-            print(f"\n   {i}. {risk['signal']}")
-            print(f"      원인: {risk['reason']}")
-            print(f"      영향: {risk['impact']}")
+        risk_block = _render_items(f"\n🚨 HIGH PRIORITY RISKS ({len(risks)}개):\n", risks)
     else:
-        print(f"\n✅ HIGH 레벨 위험 없음")
+        risk_block = "\n✅ HIGH 레벨 위험 없음\n"
     
     if warnings:
-        print(f"\n⚠️  MEDIUM PRIORITY WARNINGS ({len(warnings)}개):")
-        for i, warning in enumerate(warnings, 1):
-            print(f"\n   {i}. {warning['signal']}")
-            print(f"      원인: {warning['reason']}")
-            print(f"      영향: {warning['impact']}")
+        warning_block = _render_items(f"\n⚠️  MEDIUM PRIORITY WARNINGS ({len(warnings)}개):\n", warnings)
     else:
-        print(f"\n✅ MEDIUM 레벨 경고 없음")
-    
-    # === 단타 승률 가능성 ===
-    win_rate = define_win_rate_potential(analysis)
-    
-    print("\n" + "-"*80)
-    print("📈 DAY TRADING WIN RATE POTENTIAL")
-    print("-"*80)
+        warning_block = "\n✅ MEDIUM 레벨 경고 없음\n"
     
-    print(f"\n전체 점수: {win_rate['potential_win_rate']:.1%} ({win_rate['category']})")
-    print(f"평가: {win_rate['description']}")
-    print(f"\n구성 요소:")
+    component_lines = []
     for component, (score, desc) in win_rate['components'].items():
         bar = "█" * int(score * 10) + "░" * (10 - int(score * 10))
-        print(f"  • {component:20s}: {bar} {score:.1%} - {desc}")
-    
-    # === 다음 단계 체크리스트 ===
-    checklist = generate_checklist(analysis, win_rate, risks, warnings)
-    
-    print("\n" + "-"*80)
-    print("✅ NEXT STEPS CHECKLIST")
-    print("-"*80)
+        component_lines.append(_COMPONENT_LINE_TEMPLATE.format(component, bar, score, desc))
     
+    checklist_lines = []
     for item in checklist:
-        print(f"\n{item['stage']} {item['status']}")
-        if 'condition' in item:
-            print(f"  조건: {item['condition']}")
-        if 'target' in item:
-            print(f"  목표: {item['target']}")
-        if 'action' in item:
-            print(f"  조치: {item['action']}")
-        if 'rationale' in item:
-            print(f"  근거: {item['rationale']}")
-        if 'estimated_time' in item:
-            print(f"  예상시간: {item['estimated_time']}")
+        checklist_lines.append(f"\n{item['stage']} {item['status']}\n")
+        for key, label in _CHECKLIST_FIELDS:
+            if key in item:
+                checklist_lines.append(f"  {label}: {item[key]}\n")
+    
+    potential = win_rate['potential_win_rate']
+    recommendation = next(text for floor, text in _RECOMMENDATIONS if potential >= floor)
+    
+    # 리포트 전체를 한 번에 기록
+    sys.stdout.write(_REPORT_TEMPLATE.format_map({
+        'a': analysis,
+        'ai': ai,
+        'state': state,
+        'win': win_rate,
+        'buy_pct': analysis['buy_ratio'] * 100,
+        'aggressiveness_verdict': '✅ 적절' if state['aggressiveness_level'] in ['MEDIUM', 'MEDIUM-HIGH'] else '⚠️ 검토 필요',
+        'filter_verdict': (
+            "   ✅ 필터 효율: 높은 신호만 선택 중 (좋음)"
+            if ai['sent']['mean'] > ai['rejected']['mean'] else
+            "   ⚠️  필터 효율: REVERSED! 낮은 신호가 실행 중 (위험)"
+        ),
+        'rejection_lines': rejection_lines,
+        'risk_block': risk_block,
+        'warning_block': warning_block,
+        'component_lines': "".join(component_lines),
+        'checklist_block': "".join(checklist_lines),
+        'recommendation': recommendation,
+    }))
+    sys.stdout.flush()
+
+def main():
+    import argparse
     
-    # === 최종 권장사항 ===
-    print("\n" + "="*80)
-    print("🎯 FINAL RECOMMENDATION")
-    print("="*80)
+    parser = argparse.ArgumentParser(description='QUANT-EVO Research Engine')
+    parser.add_argument('--cache', action='store_true',
+                        help='파일별 집계를 shared/logs/.cache에 저장해 바뀌지 않은 로그는 다시 파싱하지 않음')
+    parser.add_argument('--json', action='store_true',
+                        help='텍스트 리포트 대신 버전별 분석/평가를 JSON으로 stdout에 출력')
+    args = parser.parse_args()
     
-    if win_rate['potential_win_rate'] >= 0.85:
-        print("\n✅ READY FOR LIVE TESTING")
-        print("\n이 프롬프트는 실전 거래 테스트를 시작할 준비가 되었습니다.")
-        print("• 작은 규모부터 시작하세요")
-        print("• 실행된 거래의 결과를 추적하세요")
-        print("• 수익/손실보다는 기계적 거래 실행에 집중하세요")
-    elif win_rate['potential_win_rate'] >= 0.70:
-        print("\n⚠️  GOOD BUT NEEDS MONITORING")
-        print("\n이 프롬프트는 유망하지만 추가 검증이 필요합니다.")
-        print("• 추가 100-200개 신호를 수집하세요")
-        print("• 안정성을 모니터링하세요")
-        print("• 경고 항목들을 지켜보세요")
-    elif win_rate['potential_win_rate'] >= 0.55:
-        print("\n🔄 NEEDS REFINEMENT")
-        print("\n이 프롬프트는 개선이 필요합니다.")
-        print("• 주요 위험 신호들을 해결하세요")
-        print("• 필터 파라미터를 재검토하세요")
-        print("• 프롬프트 미세 조정을 고려하세요")
-    else:
-        print("\n❌ MAJOR REVISION REQUIRED")
-        print("\n이 프롬프트는 전반적인 재검토가 필요합니다.")
-        print("• 현재 설정으로는 위험합니다")
-        print("• 프롬프트의 핵심 로직을 다시 검토하세요")
-        print("• 필터 파라미터를 완전히 재설정하세요")
+    # JSON 모드에서는 stdout을 JSON 전용으로 두고 진행 메시지는 stderr로
+    log = partial(print, file=sys.stderr) if args.json else print
     
-    print("\n" + "="*80)
-    print("📌 NOTE: 이 평가는 로그 통계만을 기반으로 합니다.")
-    print("   손익이나 실제 거래 결과는 포함되지 않습니다.")
-    print("="*80 + "\n")
-
-def main():
     project_root = Path(__file__).resolve().parents[1]
     logs_dir = project_root / "shared" / "logs"
     
-    print(f"\n🔍 로그 디렉토리: {logs_dir}")
-    
-    # 로그 로드
-    events = load_jsonl_files(str(logs_dir))
+    log(f"\n🔍 로그 디렉토리: {logs_dir}")
     
-    if not events:
-        print("❌ 로그 파일을 찾을 수 없습니다.")
-        print("   최소 1분 이상 앱을 실행한 후 다시 시도하세요.")
+    if args.cache:
+        # 파일별 증분 집계 (변경된 파일만 파싱)
+        tallies, event_count = load_version_tallies(str(logs_dir), logs_dir / ".cache" / "research_tallies.pkl")
+        by_version = None
+    else:
+        # 로그를 스트리밍하면서 바로 버전/타입별로 분류
+        by_version = categorize_events(iter_events(str(logs_dir)))
+        # 모든 이벤트는 정확히 한 목록에 들어가므로 목록 길이 합이 전체 이벤트 수
+        event_count = sum(len(typed) for grouped in by_version.values() for typed in grouped.values())
+    
+    if not event_count:
+        log("❌ 로그 파일을 찾을 수 없습니다.")
+        log("   최소 1분 이상 앱을 실행한 후 다시 시도하세요.")
         return
     
-    print(f"✅ {len(events)}개 이벤트 로드됨\n")
+    log(f"✅ {event_count}개 이벤트 로드됨\n")
     
     # 버전별 분석
-    by_version = categorize_events(events)
+    # 버전 ID는 한 번만 정렬해서 목록 출력과 분석 순서에 함께 사용
+    version_ids = sorted(tallies if by_version is None else by_version)
+    
+    log(f"📋 {len(version_ids)}개 버전 발견됨:")
+    for version_id in version_ids:
+        log(f"   • {version_id}")
     
-    print(f"📋 {len(by_version)}개 버전 발견됨:")
-    for version_id in by_version.keys():
-        print(f"   • {version_id}")
+    if by_version is None:
+        analyses = [summarize_version(tallies[version_id], version_id) for version_id in version_ids]
+    else:
+        # 분석은 병렬로, 출력은 순서대로
+        analyses = analyze_versions(by_version, version_ids)
+    
+    if args.json:
+        # 버전별 {analysis, state, risks, warnings, win_rate, checklist} 배열을 한 번에 기록
+        sys.stdout.buffer.write(_dump_json([
+            {'analysis': analysis, **evaluate_version(analysis)} for analysis in analyses
+        ]))
+        sys.stdout.flush()
+        return
     
-    # 각 버전 분석
+    # 각 버전 리포트
     print("\n" + "="*80)
     
-    for version_id in sorted(by_version.keys()):
-        version_events = by_version[version_id]
-        analysis = analyze_version(version_events, version_id)
+    for analysis in analyses:
         print_research_report(analysis, by_version)
 
 if __name__ == "__main__":
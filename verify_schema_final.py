@@ -4,244 +4,426 @@ DB Schema Stabilization - Final Verification Script (No emoji version)
 Tests idempotency, schema consistency, and data integrity.
 """
 
+import argparse
+import importlib
+import json
 import sqlite3
 import sys
 import os
-from datetime import datetime, timezone, timedelta
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 # Add parent dir to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app32"))
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app64"))
 
-def test_app32_schema():
-    """Test app32/db.py schema stability."""
-    print("\n" + "="*60)
-    print("TEST: app32/db.py Schema Verification")
-    print("="*60)
-    
-    from app32.db import connect, init_schema, get_kst_date
+# Each suite runs on its own in-memory DB (no file creation, unlink or
+# journal I/O), so the two can run concurrently. Set TRADING_DB_URI to a
+# file: URI beforehand to verify an on-disk DB instead: both suites then
+# share it and run one after the other, and the test order is rolled back
+# rather than committed. Note that app*/db.py connect() honors the same
+# variable, so while it is exported the trading apps use that DB as well.
+_SHARED_DB_URI = os.environ.get('TRADING_DB_URI')
+_DB_URIS = {
+    'app32': _SHARED_DB_URI or 'file:test32?mode=memory&cache=shared',
+    'app64': _SHARED_DB_URI or 'file:test64?mode=memory&cache=shared',
+}
+
+# Status lines are buffered per thread and written with one stdout call
+# rather than a print() per line. Each suite's lines are handed back to
+# main() and written in order; init_schema() prints its own migration notes
+# directly, so those can appear ahead of the buffered lines.
+_BUF = threading.local()
+
+def _lines():
+    """The calling thread's status-line buffer."""
+    try:
+        return _BUF.lines
+    except AttributeError:
+        _BUF.lines = []
+        return _BUF.lines
+
+def _log(line):
+    _lines().append(line)
+
+def _flush():
+    """Write the buffered status lines in a single call."""
+    lines = _lines()
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
+# (label, ns) per timed test block, appended from both suite threads
+_TIMINGS = []
+
+@contextmanager
+def _timed(label):
+    """Record the wall time of the enclosed block under label."""
+    t0 = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _TIMINGS.append((label, time.perf_counter_ns() - t0))
+
+# Throughput-oriented settings for the verification run (durability of this
+# scratch data does not matter): WAL + synchronous=NORMAL avoids an fsync per
+# commit, 16 MB page cache, 256 MB mmap, temp tables in memory.
+_PERF_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA cache_size=-16000;"
+    "PRAGMA mmap_size=268435456;"
+)
+
+def _apply_pragmas(conn):
+    """Apply performance PRAGMAs right after connect()."""
+    mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    if mode.lower() not in ('wal', 'memory'):
+        _log(f"[WARN]: WAL not available on this path (journal_mode={mode})")
+    conn.executescript(_PERF_PRAGMAS)
+
+# Columns every app's init_schema() must provide (shared by both test functions)
+_REQ_ORDERS = frozenset({'id', 'ts', 'created_at', 'trade_day', 'symbol', 'action', 'ai_score', 'ttl_ms', 'params_version_id', 'status'})
+_REQ_EXEC = frozenset({'id', 'ts', 'module', 'symbol', 'action', 'decision', 'rejection_reason', 'ai_score', 'params_version_id', 'order_id', 'context'})
+
+# Test-order INSERT, prepared once; add rows to the executemany() batch to
+# cover more cases without re-preparing the statement.
+_INSERT_ORDER_SQL = (
+    "INSERT INTO orders_intent(ts, created_at, trade_day, symbol, action, ai_score, ttl_ms, params_version_id, status) "
+    "VALUES (?,?,?,?,?,?,?,?,?)"
+)
+
+# SQLite >= 3.35 hands the inserted row back via RETURNING, which saves the
+# read-back SELECT in Test 6; older libraries keep the INSERT + SELECT path.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_INSERT_ORDER_RETURNING_SQL = _INSERT_ORDER_SQL + " RETURNING ts, created_at, trade_day, symbol, action, status"
+
+# sqlite_schema is the current name of the catalog (SQLite >= 3.33)
+_SCHEMA_TABLE = 'sqlite_schema' if sqlite3.sqlite_version_info >= (3, 33, 0) else 'sqlite_master'
+
+# Column lists come from SQLite itself via the table-valued PRAGMA function,
+# joined onto the catalog so the whole schema is read in one query
+# (table_xinfo, which also lists generated columns, needs SQLite >= 3.26).
+_TABLE_INFO = 'pragma_table_xinfo' if sqlite3.sqlite_version_info >= (3, 26, 0) else 'pragma_table_info'
+_INTROSPECT_SQL = (
+    f"SELECT s.type, s.name, c.name FROM {_SCHEMA_TABLE} AS s "
+    f"LEFT JOIN {_TABLE_INFO}(s.name) AS c ON s.type = 'table' "
+    "WHERE s.type IN ('table', 'index')"
+)
+
+def _introspect(conn):
+    """({table: frozenset(columns)}, {index names}) from one schema-table query."""
+    cols, indexes = {}, set()
+    for kind, name, col in conn.execute(_INTROSPECT_SQL):
+        if kind == 'table':
+            cols.setdefault(name, set()).add(col)
+        else:
+            indexes.add(name)
+    return {name: frozenset(c) for name, c in cols.items()}, indexes
+
+def _verify(conn, init_schema, label):
+    """Tests 1-5, shared by both apps: init_schema() idempotency, required
+    columns and the trade_day/status/action index."""
+    _log("\n" + "="*60)
+    _log(f"TEST: {label}/db.py Schema Verification")
+    _log("="*60)
     
-    # Clean start
-    db_path = Path(__file__).resolve().parents[1] / "shared" / "data" / "trading.db"
-    if db_path.exists():
-        db_path.unlink()
-        print("[SETUP] Deleted existing DB for fresh test")
+    _apply_pragmas(conn)
     
-    conn = connect()
+    # Catch a corrupt DB before running any checks against it
+    integrity = conn.execute("PRAGMA quick_check").fetchone()[0]
+    if integrity != 'ok':
+        _log(f"[FAIL] quick_check: {integrity}")
+        return False
     
     # Test 1: First init_schema() call
-    print("\n[TEST 1] First init_schema() call...")
-    try:
-        init_schema(conn)
-        print("[PASS] init_schema() executed successfully")
-    except Exception as e:
-        print(f"[FAIL] {e}")
-        return False
+    with _timed(f"{label} TEST 1"):
+        _log("\n[TEST 1] First init_schema() call...")
+        try:
+            init_schema(conn)
+            _log("[PASS] init_schema() executed successfully")
+        except Exception as e:
+            _log(f"[FAIL] {e}")
+            return False
     
     # Test 2: Second init_schema() call (idempotency)
-    print("\n[TEST 2] Second init_schema() call (idempotency)...")
-    try:
-        init_schema(conn)
-        print("[PASS] init_schema() is idempotent (no errors on second call)")
-    except Exception as e:
-        print(f"[FAIL] {e}")
-        return False
+    with _timed(f"{label} TEST 2"):
+        _log("\n[TEST 2] Second init_schema() call (idempotency)...")
+        try:
+            init_schema(conn)
+            _log("[PASS] init_schema() is idempotent (no errors on second call)")
+        except Exception as e:
+            _log(f"[FAIL] {e}")
+            return False
     
-    # Test 3: Check orders_intent columns
-    print("\n[TEST 3] Verify orders_intent schema...")
-    cursor = conn.execute("PRAGMA table_info(orders_intent)")
-    columns = {row[1]: row[2] for row in cursor.fetchall()}
+    # The remaining checks run in one explicit transaction that the caller
+    # commits (a single durable flush at the end). It has to start after
+    # init_schema(): executescript() commits any open transaction first.
+    conn.isolation_level = None
+    conn.execute("BEGIN")
     
-    required = {'id', 'ts', 'created_at', 'trade_day', 'symbol', 'action', 'ai_score', 'ttl_ms', 'params_version_id', 'status'}
-    present = set(columns.keys())
+    with _timed(f"{label} introspect"):
+        tables, indexes = _introspect(conn)
     
-    if required <= present:
-        print(f"[PASS] All required columns present")
-        print(f"  Columns: {sorted(present)}")
-    else:
-        missing = required - present
-        print(f"[FAIL] Missing columns: {missing}")
-        return False
+    # Test 3: Check orders_intent columns
+    with _timed(f"{label} TEST 3"):
+        _log("\n[TEST 3] Verify orders_intent schema...")
+        present = tables.get('orders_intent', frozenset())
+        
+        if _REQ_ORDERS <= present:
+            _log(f"[PASS] All required columns present")
+            _log(f"  Columns: {sorted(present)}")
+        else:
+            missing = set(_REQ_ORDERS - present)
+            _log(f"[FAIL] Missing columns: {missing}")
+            return False
     
     # Test 4: Check execution_log columns
-    print("\n[TEST 4] Verify execution_log schema...")
-    cursor = conn.execute("PRAGMA table_info(execution_log)")
-    columns = {row[1]: row[2] for row in cursor.fetchall()}
-    
-    required = {'id', 'ts', 'module', 'symbol', 'action', 'decision', 'rejection_reason', 'ai_score', 'params_version_id', 'order_id', 'context'}
-    present = set(columns.keys())
-    
-    if required <= present:
-        print(f"[PASS] All required columns present")
-        print(f"  Columns: {sorted(present)}")
-    else:
-        missing = required - present
-        print(f"[FAIL] Missing columns: {missing}")
-        return False
+    with _timed(f"{label} TEST 4"):
+        _log("\n[TEST 4] Verify execution_log schema...")
+        present = tables.get('execution_log', frozenset())
+        
+        if _REQ_EXEC <= present:
+            _log(f"[PASS] All required columns present")
+            _log(f"  Columns: {sorted(present)}")
+        else:
+            missing = set(_REQ_EXEC - present)
+            _log(f"[FAIL] Missing columns: {missing}")
+            return False
     
     # Test 5: Check index
-    print("\n[TEST 5] Verify index presence...")
-    cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='idx_orders_intent_trade_day_status_action'")
-    if cursor.fetchone():
-        print("[PASS] Index idx_orders_intent_trade_day_status_action exists")
-    else:
-        print("[FAIL] Index not found")
-        return False
+    with _timed(f"{label} TEST 5"):
+        _log("\n[TEST 5] Verify index presence...")
+        if 'idx_orders_intent_trade_day_status_action' in indexes:
+            _log("[PASS] Index idx_orders_intent_trade_day_status_action exists")
+        else:
+            _log("[FAIL] Index not found")
+            return False
     
+    return True
+
+def _insert_and_count(conn, get_kst_date, label):
+    """Tests 6-7: insert a test order and run the count_sent_buy_today() query."""
     # Test 6: Insert test order and verify trade_day
-    print("\n[TEST 6] Insert test order and verify trade_day...")
-    trade_day = get_kst_date()
-    current_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    created_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
-    
-    try:
-        conn.execute(
-            "INSERT INTO orders_intent(ts, created_at, trade_day, symbol, action, ai_score, ttl_ms, params_version_id, status) "
-            "VALUES (?,?,?,?,?,?,?,?,?)",
-            (current_ts, created_at, trade_day, 'TEST', 'BUY', 0.5, 5000, 'test_v1', 'NEW')
-        )
-        conn.commit()
+    with _timed(f"{label} TEST 6"):
+        _log("\n[TEST 6] Insert test order and verify trade_day...")
+        trade_day = get_kst_date()
+        # One clock reading feeds both formats (local ts, UTC ISO created_at in ms)
+        now = time.time()
+        current_ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        created_at = datetime.fromtimestamp(now, timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
         
-        # Verify inserted
-        row = conn.execute(
-            "SELECT ts, created_at, trade_day, symbol, action, status FROM orders_intent WHERE symbol='TEST' ORDER BY id DESC LIMIT 1"
-        ).fetchone()
+        try:
+            order = (current_ts, created_at, trade_day, 'TEST', 'BUY', 0.5, 5000, 'test_v1', 'NEW')
+            if _HAS_RETURNING:
+                # fetchall() steps the statement to completion so it is not left pending
+                row = next(iter(conn.execute(_INSERT_ORDER_RETURNING_SQL, order).fetchall()), None)
+            else:
+                conn.executemany(_INSERT_ORDER_SQL, [order])
         
-        if row and row[2] == trade_day:  # trade_day at index 2
-            print(f"[PASS] Order inserted with trade_day={trade_day}")
-            print(f"  ts={row[0]}, created_at={row[1]}, trade_day={row[2]}")
-        else:
-            print(f"[FAIL] trade_day not set correctly. Row: {row}")
+                # Verify inserted
+                row = conn.execute(
+                    "SELECT ts, created_at, trade_day, symbol, action, status FROM orders_intent WHERE symbol='TEST' ORDER BY id DESC LIMIT 1"
+                ).fetchone()
+        
+            if row and row[2] == trade_day:  # trade_day at index 2
+                _log(f"[PASS] Order inserted with trade_day={trade_day}")
+                _log(f"  ts={row[0]}, created_at={row[1]}, trade_day={row[2]}")
+            else:
+                _log(f"[FAIL] trade_day not set correctly. Row: {row}")
+                return False
+        except Exception as e:
+            _log(f"[FAIL] {e}")
             return False
-    except Exception as e:
-        print(f"[FAIL] {e}")
-        return False
     
     # Test 7: Test count_sent_buy_today() query
-    print("\n[TEST 7] Test count_sent_buy_today() query (trade_day based)...")
-    try:
-        # First update order to SENT
-        conn.execute("UPDATE orders_intent SET status='SENT', action='BUY' WHERE symbol='TEST'")
-        conn.commit()
+    with _timed(f"{label} TEST 7"):
+        _log("\n[TEST 7] Test count_sent_buy_today() query (trade_day based)...")
+        try:
+            # First update order to SENT
+            conn.execute("UPDATE orders_intent SET status='SENT', action='BUY' WHERE symbol='TEST'")
         
-        # Now count
-        count = conn.execute(
-            "SELECT COUNT(*) FROM orders_intent WHERE status='SENT' AND action='BUY' AND trade_day=?",
-            (trade_day,)
-        ).fetchone()[0]
+            # Now count
+            count = conn.execute(
+                "SELECT COUNT(*) FROM orders_intent WHERE status='SENT' AND action='BUY' AND trade_day=?",
+                (trade_day,)
+            ).fetchone()[0]
         
-        if count >= 1:
-            print(f"[PASS] count_sent_buy_today() query works, count={count}")
-        else:
-            print(f"[FAIL] Expected at least 1 BUY order, got {count}")
+            if count >= 1:
+                _log(f"[PASS] count_sent_buy_today() query works, count={count}")
+            else:
+                _log(f"[FAIL] Expected at least 1 BUY order, got {count}")
+                return False
+        except Exception as e:
+            _log(f"[FAIL] {e}")
             return False
-    except Exception as e:
-        print(f"[FAIL] {e}")
-        return False
     
-    conn.close()
     return True
 
-def test_app64_schema():
-    """Test app64/db.py schema stability."""
-    print("\n" + "="*60)
-    print("TEST: app64/db.py Schema Verification")
-    print("="*60)
+@lru_cache(maxsize=None)
+def _load(pkg):
+    """pkg.db module, imported once per run."""
+    return importlib.import_module(pkg + '.db')
+
+def test_app32_schema(uri):
+    """Test app32/db.py schema stability on the DB at uri."""
+    db = _load('app32')
     
-    from app64.db import connect, init_schema
+    conn = db.connect(uri)
+    ok = _verify(conn, db.init_schema, 'app32') and _insert_and_count(conn, db.get_kst_date, 'app32')
+    if ok:
+        # On a real DB the TEST order would count toward today's DAILY_LIMIT,
+        # so only the (schema-only) init_schema() changes are kept there
+        conn.execute("ROLLBACK" if _SHARED_DB_URI else "COMMIT")
+        # Let SQLite refresh planner stats (e.g. for the new index); usually a no-op
+        conn.execute("PRAGMA optimize")
+    conn.close()
+    return ok
+
+def test_app64_schema(uri):
+    """Test app64/db.py schema stability on the DB at uri."""
+    db = _load('app64')
     
-    # Use same DB (shared)
-    conn = connect()
+    conn = db.connect(uri)
+    ok = _verify(conn, db.init_schema, 'app64')
+    if ok:
+        conn.execute("COMMIT")
+        # Let SQLite refresh planner stats (e.g. for the new index); usually a no-op
+        conn.execute("PRAGMA optimize")
+    conn.close()
+    return ok
+
+@lru_cache(maxsize=None)
+def _declared_columns(pkg):
+    """{table: columns} that pkg's init_schema() creates, on a scratch DB."""
+    conn = sqlite3.connect(':memory:')
+    _load(pkg).init_schema(conn)
+    tables, _ = _introspect(conn)
+    conn.close()
+    return tables
+
+def test_schema_consistency(uri):
+    """app64's init_schema() on app32's DB: the tables hold every column either app declares."""
+    _log("\n" + "="*60)
+    _log("TEST: app32/app64 Schema Consistency")
+    _log("="*60)
     
-    # Test 1: First init_schema() call
-    print("\n[TEST 1] First init_schema() call...")
+    db = _load('app64')
+    conn = db.connect(uri)
     try:
-        init_schema(conn)
-        print("[PASS] init_schema() executed successfully")
+        db.init_schema(conn)
+        _log("[PASS] app64 init_schema() runs on app32's tables")
     except Exception as e:
-        print(f"[FAIL] {e}")
+        _log(f"[FAIL] {e}")
+        conn.close()
         return False
+    tables, _ = _introspect(conn)
+    conn.close()
     
-    # Test 2: Second init_schema() call (idempotency)
-    print("\n[TEST 2] Second init_schema() call (idempotency)...")
+    ok = True
+    for table in ('orders_intent', 'execution_log'):
+        present = tables.get(table, frozenset())
+        for pkg in ('app32', 'app64'):
+            missing = _declared_columns(pkg).get(table, frozenset()) - present
+            if missing:
+                _log(f"[FAIL] {table} lacks {pkg} columns: {sorted(missing)}")
+                ok = False
+    if ok:
+        _log("[PASS] orders_intent and execution_log consistent between app32 and app64")
+    return ok
+
+def _run_suite(test, uri):
+    """Run one test function; returns (passed, its lines, ms)."""
+    outer = _lines()
+    _BUF.lines = []
+    t0 = time.perf_counter()
     try:
-        init_schema(conn)
-        print("[PASS] init_schema() is idempotent (no errors on second call)")
+        passed = test(uri)
     except Exception as e:
-        print(f"[FAIL] {e}")
-        return False
-    
-    # Test 3: Verify schemas match between app32 and app64
-    print("\n[TEST 3] Verify schema consistency between app32 and app64...")
-    cursor = conn.execute("PRAGMA table_info(orders_intent)")
-    app64_cols = {row[1]: row[2] for row in cursor.fetchall()}
-    
-    cursor = conn.execute("PRAGMA table_info(execution_log)")
-    app64_exec_cols = {row[1]: row[2] for row in cursor.fetchall()}
-    
-    # Check orders_intent
-    required_orders = {'id', 'ts', 'created_at', 'trade_day', 'symbol', 'action', 'ai_score', 'ttl_ms', 'params_version_id', 'status'}
-    if required_orders <= set(app64_cols.keys()):
-        print("[PASS] orders_intent columns consistent")
-    else:
-        missing = required_orders - set(app64_cols.keys())
-        print(f"[FAIL] Missing columns in app64 orders_intent: {missing}")
-        return False
-    
-    # Check execution_log
-    required_exec = {'id', 'ts', 'module', 'symbol', 'action', 'decision', 'rejection_reason', 'ai_score', 'params_version_id', 'order_id', 'context'}
-    if required_exec <= set(app64_exec_cols.keys()):
-        print("[PASS] execution_log columns consistent")
-    else:
-        missing = required_exec - set(app64_exec_cols.keys())
-        print(f"[FAIL] Missing columns in app64 execution_log: {missing}")
-        return False
+        _log(f"[FAIL] {e}")
+        passed = False
+    lines, _BUF.lines = _BUF.lines, outer
+    return passed, lines, (time.perf_counter() - t0) * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='DB schema stabilization verification (final)')
+    parser.add_argument('--json', action='store_true',
+                        help='print only a JSON summary (per-suite result and duration)')
+    args = parser.parse_args(argv)
     
-    # Test 4: Verify index
-    print("\n[TEST 4] Verify index presence...")
-    cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='idx_orders_intent_trade_day_status_action'")
-    if cursor.fetchone():
-        print("[PASS] Index exists in app64")
-    else:
-        print("[FAIL] Index not found in app64")
-        return False
+    _log("\n" + "#"*60)
+    _log("# DB SCHEMA STABILIZATION VERIFICATION (FINAL)")
+    _log("# Tests both app32/db.py and app64/db.py")
+    _log("#"*60)
     
-    conn.close()
-    return True
-
-def main():
-    print("\n" + "#"*60)
-    print("# DB SCHEMA STABILIZATION VERIFICATION (FINAL)")
-    print("# Tests both app32/db.py and app64/db.py")
-    print("#"*60)
+    # init_schema() prints migration notes straight to stdout; in JSON mode
+    # send them to stderr so stdout carries only the JSON document
+    with redirect_stdout(sys.stderr) if args.json else nullcontext():
+        suites = (('app32', test_app32_schema), ('app64', test_app64_schema))
+        if _SHARED_DB_URI:
+            # Concurrent writers on one DB would hit "database is locked", so
+            # the suites run in order
+            outcomes = [(f"{app} schema", _run_suite(test, _DB_URIS[app])) for app, test in suites]
+            outcomes.append(("schema consistency", _run_suite(test_schema_consistency, _SHARED_DB_URI)))
+        else:
+            # A shared-cache in-memory DB lives only while a connection is open;
+            # hold app32's so the consistency check can run app64 on its tables.
+            keep_app32 = sqlite3.connect(_DB_URIS['app32'], uri=True)
+            # sqlite3 releases the GIL while statements step, so the two suites
+            # overlap on their separate DBs; each reports back its own lines.
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                futures = [(f"{app} schema", ex.submit(_run_suite, test, _DB_URIS[app])) for app, test in suites]
+                outcomes = [(test_name, future.result()) for test_name, future in futures]
+            outcomes.append(("schema consistency", _run_suite(test_schema_consistency, _DB_URIS['app32'])))
+            keep_app32.close()
     
     results = []
+    report = []
+    for test_name, (passed, lines, ms) in outcomes:
+        _lines().extend(lines)
+        results.append((test_name, passed))
+        report.append({"name": test_name, "passed": passed, "duration_ms": round(ms, 3)})
     
-    # Test app32
-    results.append(("app32 schema", test_app32_schema()))
-    
-    # Test app64
-    results.append(("app64 schema", test_app64_schema()))
+    if args.json:
+        # One JSON document for CI instead of the human-readable report
+        _lines().clear()
+        all_passed = all(passed for _, passed in results)
+        timings_us = {label: round(ns / 1000, 1) for label, ns in _TIMINGS}
+        sys.stdout.write(json.dumps({"tests": report, "passed": all_passed, "timings_us": timings_us}) + "\n")
+        return 0 if all_passed else 1
     
     # Summary
-    print("\n" + "="*60)
-    print("SUMMARY")
-    print("="*60)
+    _log("\n" + "="*60)
+    _log("SUMMARY")
+    _log("="*60)
     for test_name, passed in results:
         status = "[PASS]" if passed else "[FAIL]"
-        print(f"{status}: {test_name}")
+        _log(f"{status}: {test_name}")
+    
+    
+    # Per-test timings, hottest first
+    _log("\nTIMINGS (hottest first)")
+    for label, ns in sorted(_TIMINGS, key=lambda t: t[1], reverse=True):
+        _log(f"  {label:<16} {ns / 1000:10.1f} us")
     
     all_passed = all(passed for _, passed in results)
-    print("\n" + ("="*60))
+    _log("\n" + ("="*60))
     if all_passed:
-        print("SUCCESS: ALL TESTS PASSED - Schema stabilization verified")
-        print("="*60)
+        _log("SUCCESS: ALL TESTS PASSED - Schema stabilization verified")
+        _log("="*60)
         return 0
     else:
-        print("FAILURE: SOME TESTS FAILED - Review errors above")
-        print("="*60)
+        _log("FAILURE: SOME TESTS FAILED - Review errors above")
+        _log("="*60)
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        sys.exit(main())
+    finally:
+        _flush()